@@ -1,96 +1,138 @@
-"""
-Claim Parser Agent - Parses train/test CSV files into structured claims.
-
-Reads data/train.csv and data/test.csv, extracts claims,
-and outputs claims/claims.jsonl.
-"""
-
-import csv
-import json
-from pathlib import Path
-
-# Configuration
-TRAIN_FILE = Path("Data/train.csv")
-TEST_FILE = Path("Data/test.csv")
-OUTPUT_FILE = Path("claims/claims.jsonl")
-
-
-def parse_csv(filepath: Path, has_label: bool) -> list[dict]:
-    """Parse a CSV file into claim records."""
-    claims = []
-    
-    with open(filepath, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            claim = {
-                "claim_id": row["id"],
-                "book_name": row["book_name"],
-                "character": row["char"],
-                "caption": row.get("caption", ""),
-                "claim_text": row["content"],
-                "source": filepath.stem  # "train" or "test"
-            }
-            
-            # Add label if available (train set only)
-            if has_label and "label" in row:
-                claim["label"] = row["label"]
-            
-            claims.append(claim)
-    
-    return claims
-
-
-def main():
-    """Main entry point for claim parser agent."""
-    print("=" * 60)
-    print("CLAIM PARSER AGENT - CSV to JSONL")
-    print("=" * 60)
-    
-    all_claims = []
-    
-    # Parse train.csv
-    if TRAIN_FILE.exists():
-        train_claims = parse_csv(TRAIN_FILE, has_label=True)
-        print(f"Parsed {len(train_claims)} claims from train.csv")
-        all_claims.extend(train_claims)
-    else:
-        print(f"WARNING: {TRAIN_FILE} not found")
-    
-    # Parse test.csv
-    if TEST_FILE.exists():
-        test_claims = parse_csv(TEST_FILE, has_label=False)
-        print(f"Parsed {len(test_claims)} claims from test.csv")
-        all_claims.extend(test_claims)
-    else:
-        print(f"WARNING: {TEST_FILE} not found")
-    
-    if not all_claims:
-        print("ERROR: No claims found!")
-        return
-    
-    # Save to JSONL
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        for claim in all_claims:
-            f.write(json.dumps(claim, ensure_ascii=False) + "\n")
-    
-    print(f"\nSaved {len(all_claims)} claims to {OUTPUT_FILE}")
-    
-    # Summary
-    print("=" * 60)
-    train_count = sum(1 for c in all_claims if c["source"] == "train")
-    test_count = sum(1 for c in all_claims if c["source"] == "test")
-    print(f"  Train claims: {train_count}")
-    print(f"  Test claims: {test_count}")
-    
-    books = set(c["book_name"] for c in all_claims)
-    print(f"  Books: {', '.join(sorted(books))}")
-    
-    characters = set(c["character"] for c in all_claims)
-    print(f"  Characters: {len(characters)} unique")
-
-
-if __name__ == "__main__":
-    main()
+"""
+Claim Parser Agent - Parses train/test CSV files into structured claims.
+
+Reads data/train.csv and data/test.csv, extracts claims,
+and outputs claims/claims.jsonl.
+"""
+
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from pathlib import Path
+
+# Configuration
+TRAIN_FILE = Path("Data/train.csv")
+TEST_FILE = Path("Data/test.csv")
+OUTPUT_FILE = Path("claims/claims.jsonl")
+
+# CSV column name -> claim record key
+CSV_FIELDS = {
+    "id": "claim_id",
+    "book_name": "book_name",
+    "char": "character",
+    "caption": "caption",
+    "content": "claim_text",
+}
+
+# Explicit types skip pyarrow's per-column inference pass and keep ids
+# as strings (no accidental integer coercion of numeric claim ids)
+CSV_COLUMN_TYPES = {
+    "id": pa.string(),
+    "book_name": pa.string(),
+    "char": pa.string(),
+    "caption": pa.string(),
+    "content": pa.string(),
+    "label": pa.string(),
+}
+
+
+def _claims_from_table(table: pa.Table, has_label: bool,
+                       source: str) -> list[dict]:
+    """Convert a parsed CSV table (or batch) into claim records."""
+    present = [c for c in CSV_FIELDS if c in table.column_names]
+    selected = table.select(present)
+    selected = selected.rename_columns([CSV_FIELDS[c] for c in present])
+
+    # Add label if available (train set only)
+    if has_label and "label" in table.column_names:
+        selected = selected.append_column("label", table["label"])
+
+    claims = selected.to_pylist()
+    for claim in claims:
+        if claim.get("caption") is None:
+            claim["caption"] = ""
+        claim["source"] = source
+    return claims
+
+
+def parse_csv_iter(filepath: Path, has_label: bool, batch_size: int = 8192):
+    """Yield claim records from a CSV incrementally.
+
+    pyarrow's streaming reader parses one block at a time, so memory
+    stays O(batch) no matter how large the claim file grows, and
+    downstream consumers can start before the file is fully read.
+    """
+    source = filepath.stem  # "train" or "test"
+    with pacsv.open_csv(
+            str(filepath),
+            read_options=pacsv.ReadOptions(block_size=batch_size * 512),
+            convert_options=pacsv.ConvertOptions(
+                column_types=CSV_COLUMN_TYPES)) as reader:
+        for batch in reader:
+            yield from _claims_from_table(
+                pa.Table.from_batches([batch]), has_label, source)
+
+
+def parse_csv(filepath: Path, has_label: bool) -> list[dict]:
+    """Parse a CSV file into claim records.
+
+    pyarrow parses the CSV in native code (multithreaded, typed
+    columns); dict rows are only materialized once at the boundary
+    instead of a csv.DictReader building one per row.
+    """
+    return list(parse_csv_iter(filepath, has_label))
+
+
+def main():
+    """Main entry point for claim parser agent."""
+    print("=" * 60)
+    print("CLAIM PARSER AGENT - CSV to JSONL")
+    print("=" * 60)
+    
+    all_claims = []
+    
+    # Parse train.csv
+    if TRAIN_FILE.exists():
+        train_claims = parse_csv(TRAIN_FILE, has_label=True)
+        print(f"Parsed {len(train_claims)} claims from train.csv")
+        all_claims.extend(train_claims)
+    else:
+        print(f"WARNING: {TRAIN_FILE} not found")
+    
+    # Parse test.csv
+    if TEST_FILE.exists():
+        test_claims = parse_csv(TEST_FILE, has_label=False)
+        print(f"Parsed {len(test_claims)} claims from test.csv")
+        all_claims.extend(test_claims)
+    else:
+        print(f"WARNING: {TEST_FILE} not found")
+    
+    if not all_claims:
+        print("ERROR: No claims found!")
+        return
+    
+    # Save to JSONL
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Serialize everything first, then issue one buffered write
+    with open(OUTPUT_FILE, "wb") as f:
+        f.write(b"\n".join(orjson.dumps(claim) for claim in all_claims) + b"\n")
+    
+    print(f"\nSaved {len(all_claims)} claims to {OUTPUT_FILE}")
+    
+    # Summary
+    print("=" * 60)
+    train_count = sum(1 for c in all_claims if c["source"] == "train")
+    test_count = sum(1 for c in all_claims if c["source"] == "test")
+    print(f"  Train claims: {train_count}")
+    print(f"  Test claims: {test_count}")
+    
+    books = set(c["book_name"] for c in all_claims)
+    print(f"  Books: {', '.join(sorted(books))}")
+    
+    characters = set(c["character"] for c in all_claims)
+    print(f"  Characters: {len(characters)} unique")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,122 +1,232 @@
-"""
-Embedding Agent - Creates FAISS index from chunked novel text.
-
-Loads chunks from chunks/chunks.jsonl, embeds using SentenceTransformers,
-and saves FAISS index to index/faiss.index with metadata in index/meta.pkl.
-"""
-
-import json
-import pickle
-from pathlib import Path
-import numpy as np
-from sentence_transformers import SentenceTransformer
-import faiss
-from tqdm import tqdm
-
-# Configuration
-INPUT_FILE = Path("chunks/chunks.jsonl")
-INDEX_DIR = Path("index")
-FAISS_INDEX_FILE = INDEX_DIR / "faiss.index"
-META_FILE = INDEX_DIR / "meta.pkl"
-MODEL_NAME = "all-MiniLM-L6-v2"
-BATCH_SIZE = 64
-
-
-def load_chunks() -> list[dict]:
-    """Load chunks from JSONL file."""
-    chunks = []
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            chunks.append(json.loads(line.strip()))
-    return chunks
-
-
-def create_embeddings(chunks: list[dict], model: SentenceTransformer) -> np.ndarray:
-    """Create embeddings for all chunks."""
-    texts = [c["text"] for c in chunks]
-    
-    print(f"Creating embeddings for {len(texts)} chunks...")
-    
-    # Process in batches with progress bar
-    embeddings = []
-    for i in tqdm(range(0, len(texts), BATCH_SIZE), desc="Embedding"):
-        batch = texts[i:i + BATCH_SIZE]
-        batch_embeddings = model.encode(batch, show_progress_bar=False)
-        embeddings.append(batch_embeddings)
-    
-    return np.vstack(embeddings).astype(np.float32)
-
-
-def build_faiss_index(embeddings: np.ndarray) -> faiss.IndexFlatIP:
-    """Build FAISS index for cosine similarity search."""
-    # Normalize embeddings for cosine similarity
-    faiss.normalize_L2(embeddings)
-    
-    # Create index
-    dimension = embeddings.shape[1]
-    index = faiss.IndexFlatIP(dimension)  # Inner product = cosine sim after normalization
-    index.add(embeddings)
-    
-    return index
-
-
-def create_metadata(chunks: list[dict]) -> list[dict]:
-    """Create metadata list for chunks."""
-    return [
-        {
-            "book": c["book"],
-            "chunk_idx": c["chunk_idx"],
-            "char_start": c["char_start"],
-            "char_end": c["char_end"],
-            "text": c["text"]  # Store text for easy retrieval
-        }
-        for c in chunks
-    ]
-
-
-def main():
-    """Main entry point for embedding agent."""
-    print("=" * 60)
-    print("EMBEDDING AGENT - FAISS Index Creation")
-    print("=" * 60)
-    
-    # Check input file exists
-    if not INPUT_FILE.exists():
-        print(f"ERROR: {INPUT_FILE} not found. Run ingestion_agent.py first.")
-        return
-    
-    # Load chunks
-    chunks = load_chunks()
-    print(f"Loaded {len(chunks)} chunks")
-    
-    # Load model
-    print(f"Loading model: {MODEL_NAME}")
-    model = SentenceTransformer(MODEL_NAME)
-    
-    # Create embeddings
-    embeddings = create_embeddings(chunks, model)
-    print(f"Embeddings shape: {embeddings.shape}")
-    
-    # Build FAISS index
-    print("Building FAISS index...")
-    index = build_faiss_index(embeddings)
-    
-    # Create metadata
-    metadata = create_metadata(chunks)
-    
-    # Save everything
-    INDEX_DIR.mkdir(parents=True, exist_ok=True)
-    
-    faiss.write_index(index, str(FAISS_INDEX_FILE))
-    print(f"Saved FAISS index to {FAISS_INDEX_FILE}")
-    
-    with open(META_FILE, "wb") as f:
-        pickle.dump(metadata, f)
-    print(f"Saved metadata to {META_FILE}")
-    
-    print("=" * 60)
-    print(f"Index ready! {index.ntotal} vectors indexed.")
-
-
-if __name__ == "__main__":
-    main()
+"""
+Embedding Agent - Creates FAISS index from chunked novel text.
+
+Loads chunks from chunks/chunks.jsonl, embeds using SentenceTransformers,
+and saves FAISS index to index/faiss.index with metadata in index/meta.arrow.
+"""
+
+import math
+import orjson
+import pyarrow as pa
+from pathlib import Path
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+import faiss
+
+# Configuration
+INPUT_FILE = Path("chunks/chunks.jsonl")
+INDEX_DIR = Path("index")
+FAISS_INDEX_FILE = INDEX_DIR / "faiss.index"
+META_FILE = INDEX_DIR / "meta.arrow"
+MODEL_NAME = "all-MiniLM-L6-v2"
+BATCH_SIZE = 256
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+
+# Above this corpus size, switch from exhaustive flat search to a
+# compressed OPQ+IVF+PQ index (sub-linear search, ~32x smaller storage)
+IVF_PQ_THRESHOLD = 10_000
+IVF_NPROBE = 16
+
+# Prefer fused attention kernels (PyTorch scaled_dot_product_attention)
+torch.set_float32_matmul_precision("high")
+
+# Try to import optimum for BetterTransformer kernel fusion
+try:
+    from optimum.bettertransformer import BetterTransformer
+    BETTERTRANSFORMER_AVAILABLE = True
+except ImportError:
+    BETTERTRANSFORMER_AVAILABLE = False
+
+
+def iter_chunks():
+    """Stream (chunk, byte_offset) pairs from the JSONL file.
+
+    The byte offset of each line goes into the metadata so consumers can
+    seek straight to a chunk's text instead of keeping it in memory.
+    """
+    with open(INPUT_FILE, "rb") as f:
+        offset = 0
+        for line in f:
+            yield orjson.loads(line), offset
+            offset += len(line)
+
+
+def optimize_model(model: SentenceTransformer) -> SentenceTransformer:
+    """Apply inference-only optimizations to the embedding model."""
+    # Swap stock HuggingFace attention for PyTorch's fused
+    # scaled_dot_product_attention kernels
+    if BETTERTRANSFORMER_AVAILABLE:
+        try:
+            model[0].auto_model = BetterTransformer.transform(
+                model[0].auto_model, keep_original_model=False
+            )
+            print("  BetterTransformer: fused attention kernels enabled")
+        except Exception as e:
+            print(f"  BetterTransformer transform skipped: {e}")
+
+    # FP16 halves memory traffic on GPU
+    if DEVICE == "cuda":
+        model.half()
+
+    return model
+
+
+def create_embeddings(texts: list[str], model: SentenceTransformer) -> np.ndarray:
+    """Create embeddings for all chunk texts."""
+    print(f"Creating embeddings for {len(texts)} chunks...")
+
+    # Encode batch-by-batch straight into one preallocated array: no
+    # per-batch list accumulation and no final vstack copy, so peak
+    # memory stays at 1x the output instead of 2x
+    dim = model.get_sentence_embedding_dimension()
+    out = np.empty((len(texts), dim), dtype=np.float32)
+
+    # Encode longest-first so each batch pads to near-uniform length;
+    # mixing short and long chunks in one batch wastes compute on pad
+    # tokens. Results scatter back to original positions by index.
+    order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+
+    with torch.inference_mode():
+        for i in range(0, len(order), BATCH_SIZE):
+            batch_idx = order[i:i + BATCH_SIZE]
+            out[batch_idx] = model.encode(
+                [texts[j] for j in batch_idx],
+                batch_size=BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,  # Inner product = cosine sim downstream
+                show_progress_bar=False
+            )
+            print(f"  Encoded {min(i + BATCH_SIZE, len(texts))}/{len(texts)}")
+
+    return out
+
+
+def build_faiss_index(embeddings: np.ndarray) -> faiss.Index:
+    """Build FAISS index for cosine similarity search."""
+    # Embeddings are already L2-normalized by create_embeddings
+    dimension = embeddings.shape[1]
+    n_vectors = embeddings.shape[0]
+
+    if n_vectors > IVF_PQ_THRESHOLD:
+        # Compressed index: OPQ rotation + inverted lists + product
+        # quantization; cell-probed ADC lookups instead of O(N*d) scans
+        nlist = max(1, int(4 * math.sqrt(n_vectors)))
+        index = faiss.index_factory(
+            dimension, f"OPQ32,IVF{nlist},PQ32", faiss.METRIC_INNER_PRODUCT
+        )
+        print(f"  Training IVF-PQ index (nlist={nlist})...")
+        index.train(embeddings)
+        index.add(embeddings)
+        # The factory result is an IndexPreTransform (OPQ wrapper), so
+        # nprobe lives on the inner IVF index
+        faiss.extract_index_ivf(index).nprobe = IVF_NPROBE
+        return index
+
+    # FP16 scalar quantization halves the bytes scanned per query versus
+    # FP32 flat storage, with near-identical recall on normalized vectors
+    index = faiss.IndexScalarQuantizer(
+        dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+    )
+    index.train(embeddings)
+
+    # Build on GPU when available - the add() dot-product sweep runs as
+    # large GEMMs there - then copy back to CPU for serialization
+    if faiss.get_num_gpus() > 0:
+        res = faiss.StandardGpuResources()
+        gpu_index = faiss.index_cpu_to_gpu(res, 0, index)
+        gpu_index.add(embeddings)
+        return faiss.index_gpu_to_cpu(gpu_index)
+
+    index.add(embeddings)
+    return index
+
+
+def create_metadata(chunk: dict, jsonl_offset: int) -> dict:
+    """Create the metadata record for a single chunk.
+
+    Text is not duplicated here - consumers seek into chunks.jsonl at
+    jsonl_offset when they need it, keeping meta.arrow small and fast
+    to map.
+    """
+    return {
+        "book": chunk["book"],
+        "chunk_idx": chunk["chunk_idx"],
+        "char_start": chunk["char_start"],
+        "char_end": chunk["char_end"],
+        "temporal_slice": chunk.get("temporal_slice", "MID"),
+        "jsonl_offset": jsonl_offset
+    }
+
+
+def save_metadata(metadata: list[dict]) -> None:
+    """Write metadata as a columnar Arrow IPC file.
+
+    Struct-of-arrays instead of a pickled list[dict]: the retriever
+    memory-maps the file and touches only the rows it reads, so startup
+    costs page faults rather than an O(N) unpickle that hydrates a dict
+    per chunk. Book and slice names are dictionary-encoded - a handful
+    of unique strings shared across millions of rows.
+    """
+    table = pa.table({
+        "book": pa.array([m["book"] for m in metadata]).dictionary_encode(),
+        "chunk_idx": pa.array([m["chunk_idx"] for m in metadata], pa.int32()),
+        "char_start": pa.array([m["char_start"] for m in metadata], pa.int64()),
+        "char_end": pa.array([m["char_end"] for m in metadata], pa.int64()),
+        "temporal_slice": pa.array(
+            [m["temporal_slice"] for m in metadata]).dictionary_encode(),
+        "jsonl_offset": pa.array([m["jsonl_offset"] for m in metadata], pa.int64()),
+    })
+    with pa.OSFile(str(META_FILE), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def main():
+    """Main entry point for embedding agent."""
+    print("=" * 60)
+    print("EMBEDDING AGENT - FAISS Index Creation")
+    print("=" * 60)
+    
+    # Check input file exists
+    if not INPUT_FILE.exists():
+        print(f"ERROR: {INPUT_FILE} not found. Run ingestion_agent.py first.")
+        return
+    
+    # Stream chunks once, keeping only texts and metadata (not the raw
+    # chunk dicts) in memory
+    texts = []
+    metadata = []
+    for chunk, offset in iter_chunks():
+        texts.append(chunk["text"])
+        metadata.append(create_metadata(chunk, offset))
+    print(f"Loaded {len(texts)} chunks")
+
+    # Load model
+    print(f"Loading model: {MODEL_NAME} (device: {DEVICE})")
+    model = SentenceTransformer(MODEL_NAME, device=DEVICE)
+    model = optimize_model(model)
+
+    # Create embeddings
+    embeddings = create_embeddings(texts, model)
+    print(f"Embeddings shape: {embeddings.shape}")
+
+    # Build FAISS index
+    print("Building FAISS index...")
+    index = build_faiss_index(embeddings)
+
+    # Save everything
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    
+    faiss.write_index(index, str(FAISS_INDEX_FILE))
+    print(f"Saved FAISS index to {FAISS_INDEX_FILE}")
+    
+    save_metadata(metadata)
+    print(f"Saved metadata to {META_FILE}")
+    
+    print("=" * 60)
+    print(f"Index ready! {index.ntotal} vectors indexed.")
+
+
+if __name__ == "__main__":
+    main()
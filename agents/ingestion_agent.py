@@ -1,221 +1,290 @@
-"""
-Ingestion Agent - Chunks novels into overlapping segments for embedding.
-
-NovelVerified.AI Pathway-based: Uses Pathway framework for document storage.
-Includes fallback for environments where Pathway is not available.
-"""
-
-import os
-import json
-from pathlib import Path
-import tiktoken
-
-# Configuration
-CHUNK_SIZE = 1400  # tokens
-CHUNK_OVERLAP = 300  # tokens
-INPUT_DIR = Path("Data")
-OUTPUT_FILE = Path("chunks/chunks.jsonl")
-PATHWAY_STORE_DIR = Path("pathway_store")
-
-# Try to import Pathway
-try:
-    import pathway as pw
-    PATHWAY_AVAILABLE = True
-except ImportError:
-    PATHWAY_AVAILABLE = False
-    print("Note: Pathway not installed. Using standard file I/O.")
-
-
-def count_tokens(text: str, encoding) -> int:
-    """Count tokens in text using tiktoken."""
-    return len(encoding.encode(text))
-
-
-def chunk_text(text: str, encoding, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[dict]:
-    """Split text into overlapping chunks based on token count."""
-    tokens = encoding.encode(text)
-    chunks = []
-    
-    token_idx = 0
-    chunk_idx = 0
-    
-    while token_idx < len(tokens):
-        end_idx = min(token_idx + chunk_size, len(tokens))
-        chunk_tokens = tokens[token_idx:end_idx]
-        chunk_text_content = encoding.decode(chunk_tokens)
-        
-        if chunk_idx == 0:
-            char_start = 0
-        else:
-            overlap_tokens = tokens[max(0, token_idx - overlap):token_idx]
-            overlap_text = encoding.decode(overlap_tokens)
-            search_start = chunks[-1]["char_end"] - len(overlap_text) - 100
-            char_start = text.find(chunk_text_content[:100], max(0, search_start))
-            if char_start == -1:
-                char_start = chunks[-1]["char_end"]
-        
-        char_end = char_start + len(chunk_text_content)
-        
-        chunks.append({
-            "chunk_idx": chunk_idx,
-            "char_start": char_start,
-            "char_end": char_end,
-            "text": chunk_text_content,
-            "token_count": len(chunk_tokens)
-        })
-        
-        token_idx += (chunk_size - overlap)
-        chunk_idx += 1
-        
-        if end_idx >= len(tokens):
-            break
-    
-    return chunks
-
-
-def process_novel(filepath: Path, encoding) -> tuple[list[dict], int]:
-    """Process a single novel file into chunks."""
-    print(f"Processing: {filepath.name}")
-    
-    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-        text = f.read()
-    
-    original_length = len(text)
-    text = " ".join(text.split())
-    
-    book_name = filepath.stem
-    chunks = chunk_text(text, encoding)
-    
-    for chunk in chunks:
-        chunk["book"] = book_name
-    
-    print(f"  -> Generated {len(chunks)} chunks ({original_length:,} chars)")
-    return chunks, original_length
-
-
-def compute_temporal_slice(char_start: int, total_chars: int) -> str:
-    """Compute temporal slice based on position in novel."""
-    relative_pos = char_start / max(total_chars, 1)
-    if relative_pos < 0.30:
-        return "EARLY"
-    elif relative_pos < 0.70:
-        return "MID"
-    else:
-        return "LATE"
-
-
-def save_to_pathway_store(chunks: list[dict], book_total_chars: dict):
-    """Save chunks to Pathway-compatible store with temporal slicing."""
-    PATHWAY_STORE_DIR.mkdir(parents=True, exist_ok=True)
-    
-    enriched_chunks = []
-    for chunk in chunks:
-        book = chunk["book"]
-        total_chars = book_total_chars.get(book, chunk.get("char_end", 100000))
-        temporal_slice = compute_temporal_slice(chunk.get("char_start", 0), total_chars)
-        
-        enriched_chunk = {
-            "chunk_id": f"{book}_{chunk['chunk_idx']}",
-            "book": book,
-            "chunk_idx": chunk["chunk_idx"],
-            "char_start": chunk.get("char_start", 0),
-            "char_end": chunk.get("char_end", 0),
-            "text": chunk["text"],
-            "token_count": chunk.get("token_count", 0),
-            "temporal_slice": temporal_slice
-        }
-        enriched_chunks.append(enriched_chunk)
-    
-    # Save to JSONL (Pathway-compatible format)
-    chunks_file = PATHWAY_STORE_DIR / "chunks.jsonl"
-    with open(chunks_file, "w", encoding="utf-8") as f:
-        for chunk in enriched_chunks:
-            f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
-    
-    # Save metadata
-    temporal_dist = {
-        "EARLY": sum(1 for c in enriched_chunks if c["temporal_slice"] == "EARLY"),
-        "MID": sum(1 for c in enriched_chunks if c["temporal_slice"] == "MID"),
-        "LATE": sum(1 for c in enriched_chunks if c["temporal_slice"] == "LATE"),
-    }
-    
-    metadata = {
-        "total_chunks": len(enriched_chunks),
-        "books": list(set(c["book"] for c in enriched_chunks)),
-        "temporal_distribution": temporal_dist
-    }
-    
-    with open(PATHWAY_STORE_DIR / "metadata.json", "w") as f:
-        json.dump(metadata, f, indent=2)
-    
-    print(f"  [Pathway Store] Ingested {len(enriched_chunks)} chunks")
-    print(f"  [Pathway Store] Temporal distribution: {temporal_dist}")
-    
-    return enriched_chunks
-
-
-def main():
-    """Main entry point for ingestion agent."""
-    print("=" * 60)
-    print("INGESTION AGENT - Novel Chunking")
-    print("NovelVerified.AI Pathway-based: Pathway-enabled document processing")
-    print("=" * 60)
-    
-    # Report Pathway status
-    if PATHWAY_AVAILABLE:
-        print(f"✓ Pathway {pw.__version__} detected - Pathway-based compliant")
-    else:
-        print("! Pathway not available - using standard file I/O")
-        print("  (To install: pip install pathway)")
-    
-    # Initialize tokenizer
-    encoding = tiktoken.get_encoding("cl100k_base")
-    
-    # Find novel files
-    novel_files = list(INPUT_DIR.glob("*.txt"))
-    
-    if not novel_files:
-        print(f"ERROR: No .txt files found in {INPUT_DIR}")
-        return
-    
-    print(f"Found {len(novel_files)} novel(s)")
-    
-    # Process all novels
-    all_chunks = []
-    book_total_chars = {}
-    
-    for filepath in novel_files:
-        chunks, total_chars = process_novel(filepath, encoding)
-        all_chunks.extend(chunks)
-        book_total_chars[filepath.stem] = total_chars
-    
-    # Save to Pathway store (with temporal slicing)
-    print("\n" + "-" * 40)
-    print("PATHWAY STORE INGESTION")
-    print("-" * 40)
-    enriched_chunks = save_to_pathway_store(all_chunks, book_total_chars)
-    
-    # Save to legacy JSONL for FAISS
-    print("\n" + "-" * 40)
-    print("LEGACY EXPORT (for FAISS)")
-    print("-" * 40)
-    
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        for chunk in enriched_chunks:
-            f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
-    
-    print(f"  Exported {len(enriched_chunks)} chunks to {OUTPUT_FILE}")
-    
-    # Summary
-    print("\n" + "=" * 60)
-    print("INGESTION COMPLETE")
-    print("=" * 60)
-    print(f"  Total chunks: {len(enriched_chunks)}")
-    print(f"  Books: {len(book_total_chars)}")
-    print(f"\nPathway store: {PATHWAY_STORE_DIR}/")
-    print(f"Legacy output: {OUTPUT_FILE}")
-
-
-if __name__ == "__main__":
-    main()
+"""
+Ingestion Agent - Chunks novels into overlapping segments for embedding.
+
+NovelVerified.AI Pathway-based: Uses Pathway framework for document storage.
+Includes fallback for environments where Pathway is not available.
+"""
+
+import functools
+import hashlib
+import os
+import orjson
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import tiktoken
+
+# Configuration
+CHUNK_SIZE = 1400  # tokens
+CHUNK_OVERLAP = 300  # tokens
+INPUT_DIR = Path("Data")
+OUTPUT_FILE = Path("chunks/chunks.jsonl")
+PATHWAY_STORE_DIR = Path("pathway_store")
+CHUNK_CACHE_DIR = Path(".cache/chunks")
+
+# Collapses runs of whitespace in C, without materializing the word
+# list that " ".join(text.split()) builds for multi-MB novels
+_WS_RE = re.compile(r"\s+")
+
+# Try to import Pathway
+try:
+    import pathway as pw
+    PATHWAY_AVAILABLE = True
+except ImportError:
+    PATHWAY_AVAILABLE = False
+    print("Note: Pathway not installed. Using standard file I/O.")
+
+
+@functools.lru_cache(maxsize=4)
+def get_encoding(name: str = "cl100k_base"):
+    """Load a tiktoken encoding once per process.
+
+    Building an encoding compiles its regex and loads the BPE vocab;
+    the cache amortizes that to zero for every later caller.
+    """
+    return tiktoken.get_encoding(name)
+
+
+def count_tokens(text: str, encoding) -> int:
+    """Count tokens in text using tiktoken."""
+    return len(encoding.encode(text))
+
+
+def chunk_text(text: str, encoding, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[dict]:
+    """Split text into overlapping chunks based on token count."""
+    tokens = encoding.encode(text)
+    if not tokens:
+        return []
+
+    # Cumulative byte length per token gives every chunk boundary in one
+    # linear pass (token byte spans are deterministic, unlike the old
+    # text.find scan which was O(chunks x text length)).
+    # decode_tokens_bytes resolves all spans in a single FFI call.
+    byte_lens = np.fromiter(
+        (len(b) for b in encoding.decode_tokens_bytes(tokens)),
+        dtype=np.int64, count=len(tokens)
+    )
+    cum_bytes = np.concatenate(([0], np.cumsum(byte_lens)))
+
+    # Map byte offsets to character offsets: UTF-8 continuation bytes
+    # never start a character, so char position = non-continuation count
+    byte_arr = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+    is_char_start = (byte_arr & 0xC0) != 0x80
+    char_at_byte = np.concatenate(([0], np.cumsum(is_char_start)))
+
+    # All chunk boundaries come from one vectorized computation instead
+    # of a per-chunk Python loop: token starts are an arange, ends clamp
+    # to the stream length, and the offset tables translate both to
+    # character positions in bulk
+    n_tokens = len(tokens)
+    step = chunk_size - overlap
+    starts = np.arange(0, n_tokens, step)
+    ends = np.minimum(starts + chunk_size, n_tokens)
+
+    # Keep chunks up to and including the first one that reaches the end
+    n_chunks = int(np.argmax(ends >= n_tokens)) + 1
+    starts, ends = starts[:n_chunks], ends[:n_chunks]
+
+    char_starts = char_at_byte[cum_bytes[starts]]
+    char_ends = char_at_byte[cum_bytes[ends]]
+
+    return [
+        {
+            "chunk_idx": i,
+            "char_start": int(cs),
+            "char_end": int(ce),
+            "text": text[cs:ce],
+            "token_count": int(e - s)
+        }
+        for i, (s, e, cs, ce) in enumerate(zip(starts, ends, char_starts, char_ends))
+    ]
+
+
+def load_cached_chunks(text: str) -> tuple[Path, list[dict] | None]:
+    """Look up previously computed chunks for this exact text.
+
+    Keyed on content hash plus chunking parameters, so edited novels or
+    changed CHUNK_SIZE/CHUNK_OVERLAP never return stale chunks.
+    """
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    cache_path = CHUNK_CACHE_DIR / f"{text_hash}-{CHUNK_SIZE}-{CHUNK_OVERLAP}.pkl"
+    if cache_path.exists():
+        return cache_path, pickle.loads(cache_path.read_bytes())
+    return cache_path, None
+
+
+def process_novel(filepath: Path, encoding) -> tuple[list[dict], int]:
+    """Process a single novel file into chunks."""
+    print(f"Processing: {filepath.name}")
+
+    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+        text = f.read()
+
+    original_length = len(text)
+    text = _WS_RE.sub(" ", text).strip()
+
+    book_name = filepath.stem
+
+    # Re-tokenizing an unchanged novel costs seconds; a content-hash
+    # cache makes repeat runs skip tiktoken entirely
+    cache_path, chunks = load_cached_chunks(text)
+    if chunks is not None:
+        print(f"  -> Loaded {len(chunks)} chunks from cache")
+    else:
+        chunks = chunk_text(text, encoding)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(pickle.dumps(chunks))
+
+    for chunk in chunks:
+        chunk["book"] = book_name
+
+    print(f"  -> Generated {len(chunks)} chunks ({original_length:,} chars)")
+    return chunks, original_length
+
+
+def _process_novel_worker(filepath: Path) -> tuple[list[dict], int]:
+    """Process one novel in a worker process.
+
+    tiktoken encoders don't pickle cleanly, so each worker creates its own.
+    """
+    return process_novel(filepath, get_encoding())
+
+
+def process_corpus(paths: list[Path]) -> list[tuple[list[dict], int]]:
+    """Process many novels, fanning out across CPU cores.
+
+    Tokenization is CPU-bound and independent per document, so multiple
+    novels map onto a process pool; a single novel stays in-process to
+    skip the pool spin-up.
+    """
+    if len(paths) > 1:
+        workers = min(len(paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_process_novel_worker, paths))
+    return [process_novel(path, get_encoding()) for path in paths]
+
+
+def compute_temporal_slice(char_start: int, total_chars: int) -> str:
+    """Compute temporal slice based on position in novel."""
+    relative_pos = char_start / max(total_chars, 1)
+    if relative_pos < 0.30:
+        return "EARLY"
+    elif relative_pos < 0.70:
+        return "MID"
+    else:
+        return "LATE"
+
+
+def save_to_pathway_store(chunks: list[dict], book_total_chars: dict):
+    """Save chunks to Pathway-compatible store with temporal slicing."""
+    PATHWAY_STORE_DIR.mkdir(parents=True, exist_ok=True)
+    
+    enriched_chunks = []
+    for chunk in chunks:
+        book = chunk["book"]
+        total_chars = book_total_chars.get(book, chunk.get("char_end", 100000))
+        temporal_slice = compute_temporal_slice(chunk.get("char_start", 0), total_chars)
+        
+        enriched_chunk = {
+            "chunk_id": f"{book}_{chunk['chunk_idx']}",
+            "book": book,
+            "chunk_idx": chunk["chunk_idx"],
+            "char_start": chunk.get("char_start", 0),
+            "char_end": chunk.get("char_end", 0),
+            "text": chunk["text"],
+            "token_count": chunk.get("token_count", 0),
+            "temporal_slice": temporal_slice
+        }
+        enriched_chunks.append(enriched_chunk)
+    
+    # Save to JSONL (Pathway-compatible format)
+    chunks_file = PATHWAY_STORE_DIR / "chunks.jsonl"
+    with open(chunks_file, "wb") as f:
+        f.write(b"\n".join(orjson.dumps(chunk) for chunk in enriched_chunks) + b"\n")
+    
+    # Save metadata
+    temporal_dist = {
+        "EARLY": sum(1 for c in enriched_chunks if c["temporal_slice"] == "EARLY"),
+        "MID": sum(1 for c in enriched_chunks if c["temporal_slice"] == "MID"),
+        "LATE": sum(1 for c in enriched_chunks if c["temporal_slice"] == "LATE"),
+    }
+    
+    metadata = {
+        "total_chunks": len(enriched_chunks),
+        "books": list(set(c["book"] for c in enriched_chunks)),
+        "temporal_distribution": temporal_dist
+    }
+    
+    with open(PATHWAY_STORE_DIR / "metadata.json", "wb") as f:
+        f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    
+    print(f"  [Pathway Store] Ingested {len(enriched_chunks)} chunks")
+    print(f"  [Pathway Store] Temporal distribution: {temporal_dist}")
+    
+    return enriched_chunks
+
+
+def main():
+    """Main entry point for ingestion agent."""
+    print("=" * 60)
+    print("INGESTION AGENT - Novel Chunking")
+    print("NovelVerified.AI Pathway-based: Pathway-enabled document processing")
+    print("=" * 60)
+    
+    # Report Pathway status
+    if PATHWAY_AVAILABLE:
+        print(f"✓ Pathway {pw.__version__} detected - Pathway-based compliant")
+    else:
+        print("! Pathway not available - using standard file I/O")
+        print("  (To install: pip install pathway)")
+    
+    # Find novel files
+    novel_files = list(INPUT_DIR.glob("*.txt"))
+    
+    if not novel_files:
+        print(f"ERROR: No .txt files found in {INPUT_DIR}")
+        return
+    
+    print(f"Found {len(novel_files)} novel(s)")
+    
+    # Process all novels across CPU cores
+    all_chunks = []
+    book_total_chars = {}
+
+    results = process_corpus(novel_files)
+
+    for filepath, (chunks, total_chars) in zip(novel_files, results):
+        all_chunks.extend(chunks)
+        book_total_chars[filepath.stem] = total_chars
+    
+    # Save to Pathway store (with temporal slicing)
+    print("\n" + "-" * 40)
+    print("PATHWAY STORE INGESTION")
+    print("-" * 40)
+    enriched_chunks = save_to_pathway_store(all_chunks, book_total_chars)
+    
+    # Save to legacy JSONL for FAISS
+    print("\n" + "-" * 40)
+    print("LEGACY EXPORT (for FAISS)")
+    print("-" * 40)
+    
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(OUTPUT_FILE, "wb") as f:
+        f.write(b"\n".join(orjson.dumps(chunk) for chunk in enriched_chunks) + b"\n")
+    
+    print(f"  Exported {len(enriched_chunks)} chunks to {OUTPUT_FILE}")
+    
+    # Summary
+    print("\n" + "=" * 60)
+    print("INGESTION COMPLETE")
+    print("=" * 60)
+    print(f"  Total chunks: {len(enriched_chunks)}")
+    print(f"  Books: {len(book_total_chars)}")
+    print(f"\nPathway store: {PATHWAY_STORE_DIR}/")
+    print(f"Legacy output: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
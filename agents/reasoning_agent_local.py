@@ -14,8 +14,12 @@ Anti-bias features preserved:
 - Constraint violation detection
 """
 
-import json
+import asyncio
+import hashlib
+import orjson
 import os
+import sqlite3
+import threading
 import time
 import logging
 import requests
@@ -24,12 +28,19 @@ from pathlib import Path
 from typing import List, Tuple, Optional
 from dotenv import load_dotenv
 
-# Import constraint types
-from constraint_types import (
-    ConstraintType, Verdict, SubClaim, ConstraintViolation, ClaimAnalysis,
-    DECOMPOSITION_PROMPT, SUPPORT_SEEKING_PROMPT,
-    CONTRADICTION_SEEKING_PROMPT
-)
+# Import constraint types (handle both direct execution and package imports)
+try:
+    from agents.constraint_types import (
+        ConstraintType, Verdict, SubClaim, ConstraintViolation, ClaimAnalysis,
+        DECOMPOSITION_PROMPT, SUPPORT_SEEKING_PROMPT,
+        CONTRADICTION_SEEKING_PROMPT
+    )
+except ImportError:
+    from constraint_types import (
+        ConstraintType, Verdict, SubClaim, ConstraintViolation, ClaimAnalysis,
+        DECOMPOSITION_PROMPT, SUPPORT_SEEKING_PROMPT,
+        CONTRADICTION_SEEKING_PROMPT
+    )
 
 load_dotenv()
 
@@ -50,12 +61,39 @@ logger = logging.getLogger('reasoning_agent_local')
 # Configuration
 # ============================================================================
 EVIDENCE_DIR = Path("evidence")
+EVIDENCE_FILE = EVIDENCE_DIR / "evidence.jsonl"
 OUTPUT_DIR = Path("verdicts")
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral:7b-instruct-q4_0")
 
-RATE_LIMIT_DELAY = 0.2
+# Backend selection: "ollama" (default) or "openai" for any
+# OpenAI-compatible server with continuous batching (vLLM, llama.cpp
+# server). vLLM admits new requests into an active batch mid-decode, so
+# feeding it with the concurrent workers below scales much further than
+# Ollama's per-instance request queue.
+#   vllm serve <model> --max-num-seqs 64
+LLM_BACKEND = os.getenv("LLM_BACKEND", "ollama").lower()
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "http://localhost:8000/v1")
+
+# One keep-alive session for every Ollama call: a single TCP handshake
+# instead of one per request, with enough pooled connections for the
+# concurrent workers
+SESSION = requests.Session()
+SESSION.mount("http://", requests.adapters.HTTPAdapter(
+    pool_connections=16, pool_maxsize=16))
+
+# Concurrent claims in flight; Ollama serves these in parallel when
+# OLLAMA_NUM_PARALLEL allows (requests beyond that queue server-side)
+MAX_CONCURRENT_CLAIMS = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
+# Claims grouped into one prompt per stage; shared instructions are
+# decoded once per group instead of once per claim
+OLLAMA_BATCH_SIZE = int(os.getenv("OLLAMA_BATCH_SIZE", "4"))
+
+# Persistent response cache: reruns after crashes or downstream tweaks
+# skip the GPU forward pass for prompts already answered
+CACHE_DB = Path(".cache/ollama_responses.db")
 
 # Anti-bias thresholds (tuned for better confidence)
 # Lower thresholds = easier to reach a definitive verdict
@@ -74,6 +112,49 @@ def safe_float(value, default=0.0) -> float:
         return default
 
 
+# ============================================================================
+# Response Cache
+# ============================================================================
+
+_cache_conn: Optional[sqlite3.Connection] = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> sqlite3.Connection:
+    """Open (once) the on-disk response cache."""
+    global _cache_conn
+    if _cache_conn is None:
+        CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+        # Calls run on worker threads, so share one connection under a lock
+        _cache_conn = sqlite3.connect(CACHE_DB, check_same_thread=False)
+        _cache_conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key BLOB PRIMARY KEY, response BLOB)")
+    return _cache_conn
+
+
+def cache_key(prompt: str) -> bytes:
+    """Cache key for a prompt: hash of model name plus full prompt text."""
+    return hashlib.blake2b(
+        f"{OLLAMA_MODEL}\n{prompt}".encode("utf-8"), digest_size=16).digest()
+
+
+def cache_get(key: bytes) -> Optional[dict]:
+    """Return the cached parsed response for key, or None."""
+    with _cache_lock:
+        row = _get_cache().execute(
+            "SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+    return orjson.loads(row[0]) if row else None
+
+
+def cache_put(key: bytes, data) -> None:
+    """Store a parsed response under key."""
+    with _cache_lock:
+        conn = _get_cache()
+        conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?)",
+                     (key, orjson.dumps(data)))
+        conn.commit()
+
+
 # ============================================================================
 # Ollama LLM Call
 # ============================================================================
@@ -87,49 +168,39 @@ def clean_and_parse_json(text: str, stage: str = "") -> Optional[dict]:
     """
     if not text:
         return get_default_response(stage)
-    
-    original_text = text
-    
-    # Step 1: Strip markdown code blocks
-    if "```" in text:
-        try:
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0]
-            else:
-                text = text.split("```")[1].split("```")[0]
-            text = text.strip()
-        except IndexError:
-            text = original_text
-    
-    # Step 2: Simple cleanup
+
+    # Markdown fences can't occur anymore: generation runs with
+    # format="json", so the sampler only emits valid JSON tokens
+
+    # Step 1: Simple cleanup
     text = text.replace('\\_', '_')  # LaTeX escapes
     text = re.sub(r':\s*(\d+\.?\d*)\s*-\s*(\d+\.?\d*)', ': 0.5', text)  # Range values
     
-    # Step 3: Try to parse directly
+    # Step 2: Try to parse directly
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
     
-    # Step 4: Try extracting JSON array (for decompose stage)
+    # Step 3: Try extracting JSON array (for decompose stage)
     try:
         match = re.search(r'\[[\s\S]*\]', text)
         if match:
-            result = json.loads(match.group(0))
+            result = orjson.loads(match.group(0))
             if isinstance(result, list) and len(result) > 0:
                 return result
     except:
         pass
     
-    # Step 5: Try extracting just the JSON object
+    # Step 4: Try extracting just the JSON object
     try:
         match = re.search(r'\{[\s\S]*\}', text)
         if match:
-            return json.loads(match.group(0))
+            return orjson.loads(match.group(0))
     except:
         pass
     
-    # Step 6: Return safe defaults based on stage
+    # Step 5: Return safe defaults based on stage
     return get_default_response(stage)
 
 
@@ -154,75 +225,162 @@ def get_default_response(stage: str) -> dict:
         return {}
 
 
-def call_ollama(prompt: str, claim_id: str, stage: str) -> Optional[dict]:
-    """Call Ollama API and parse JSON response."""
-    # Strengthen system prompt
-    system = (
-        "You are a precise JSON generator. Output ONLY valid JSON. "
-        "Do not include markdown blocks. Do not include comments. "
-        "Ensure all strings are properly escaped."
-    )
-    
-    try:
-        response = requests.post(
-            f"{OLLAMA_HOST}/api/generate",
+def generate_text(prompt: str, system: str) -> Optional[str]:
+    """Run one generation on the configured backend, returning raw text.
+
+    The "openai" backend speaks /v1/chat/completions, which both vLLM
+    and llama.cpp's server implement; the default stays on Ollama's
+    /api/generate.
+    """
+    if LLM_BACKEND == "openai":
+        response = SESSION.post(
+            f"{OPENAI_BASE_URL}/chat/completions",
             json={
                 "model": OLLAMA_MODEL,
-                "prompt": f"{system}\n\n{prompt}",
-                "stream": False,
-                "options": {
-                    "temperature": 0.1,
-                    "num_predict": 1024,
-                    "top_p": 0.9,
-                    "stop": ["```", "\n\n\n"]
-                }
+                "messages": [
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt}
+                ],
+                "response_format": {"type": "json_object"},
+                "temperature": 0.1,
+                "max_tokens": 1024
             },
             timeout=180
         )
-        
         if response.status_code != 200:
-            logger.error(f"{claim_id}/{stage}: Ollama error {response.status_code}")
+            return None
+        return response.json()["choices"][0]["message"]["content"].strip()
+
+    response = SESSION.post(
+        f"{OLLAMA_HOST}/api/generate",
+        json={
+            "model": OLLAMA_MODEL,
+            "prompt": f"{system}\n\n{prompt}",
+            "stream": False,
+            "format": "json",  # grammar-constrained decoding
+            "keep_alive": -1,  # never unload the model mid-run
+            "options": {
+                "temperature": 0.1,
+                "num_predict": 1024,
+                "top_p": 0.9,
+                "stop": ["\n\n\n"]
+            }
+        },
+        timeout=180
+    )
+    if response.status_code != 200:
+        return None
+    return response.json().get("response", "").strip()
+
+
+def call_ollama(prompt: str, claim_id: str, stage: str) -> Optional[dict]:
+    """Call the configured LLM backend and parse the JSON response."""
+    system = JSON_SYSTEM_PROMPT
+
+    # A cache hit turns the whole forward pass into a key lookup
+    key = cache_key(prompt)
+    cached = cache_get(key)
+    if cached is not None:
+        logger.info(f"{claim_id}/{stage}: cache hit")
+        return cached
+
+    try:
+        text = generate_text(prompt, system)
+        if text is None:
+            logger.error(f"{claim_id}/{stage}: LLM backend error")
             return get_default_response(stage)
         
-        text = response.json().get("response", "").strip()
-        
         # Use robust parser with stage-aware defaults
         data = clean_and_parse_json(text, stage)
-        
+
+        # Only genuine responses get cached - stage defaults mean the
+        # model failed, and a retry should hit the model again
+        if data != get_default_response(stage):
+            cache_put(key, data)
+
         # Handle list responses (for decompose stage)
         if isinstance(data, list):
             return data  # Return list directly for decompose
-        
+
         # Log if we had to use defaults (for debugging) - only for dict responses
         if isinstance(data, dict):
             if "Unable to parse" in str(data.get("support_reasoning", "")) or \
                "Unable to parse" in str(data.get("contradiction_reasoning", "")):
                 logger.info(f"{claim_id}/{stage}: Used default fallback values")
-            
+
         return data
         
     except requests.exceptions.ConnectionError:
-        logger.error(f"{claim_id}/{stage}: Cannot connect to Ollama")
+        logger.error(f"{claim_id}/{stage}: Cannot connect to LLM backend")
         return get_default_response(stage)
     except Exception as e:
         logger.error(f"{claim_id}/{stage}: Error - {e}")
         return get_default_response(stage)
 
 
+# Constant prompt scaffolding, built once at import: per-call work is
+# limited to formatting the small variable parts and a single join
+JSON_SYSTEM_PROMPT = (
+    "You are a precise JSON generator. Output ONLY valid JSON. "
+    "Do not include markdown blocks. Do not include comments. "
+    "Ensure all strings are properly escaped."
+)
+
+BATCH_PROMPT_HEADER = (
+    "Complete the following independent tasks. For each task, produce "
+    "exactly the JSON that task describes. Return ONLY a JSON array "
+    "with {n} entries, one per task, in task order."
+)
+
+
+def build_batch_prompt(prompts: List[str]) -> str:
+    """Combine several same-stage prompts into one indexed prompt."""
+    parts = [BATCH_PROMPT_HEADER.format(n=len(prompts))]
+    parts.extend(f"TASK [{i}]:\n{p}" for i, p in enumerate(prompts, 1))
+    return "\n\n".join(parts)
+
+
+def call_ollama_batch(prompts: List[str], claim_ids: List[str], stage: str) -> List[Optional[dict]]:
+    """Run several same-stage prompts in one Ollama call.
+
+    Falls back to per-claim calls when the batched response is not an
+    array of the right length, so a confused model costs one extra call
+    rather than wrong verdicts.
+    """
+    if len(prompts) == 1:
+        return [call_ollama(prompts[0], claim_ids[0], stage)]
+
+    result = call_ollama(build_batch_prompt(prompts),
+                         f"batch({','.join(claim_ids)})", stage)
+    if isinstance(result, list) and len(result) == len(prompts):
+        return result
+
+    logger.info(f"{stage}: batched response unusable, retrying per claim")
+    return [call_ollama(p, cid, stage) for p, cid in zip(prompts, claim_ids)]
+
+
 # ============================================================================
 # Multi-Stage Pipeline
 # ============================================================================
 
-def decompose_claim(claim_data: dict) -> List[SubClaim]:
-    """Decompose claim into sub-claims."""
-    prompt = DECOMPOSITION_PROMPT.format(
+def build_decompose_prompt(claim_data: dict) -> str:
+    """Build the decomposition prompt for one claim."""
+    return DECOMPOSITION_PROMPT.format(
         claim_text=claim_data["claim_text"],
         character=claim_data.get("character", "Unknown"),
         book_name=claim_data.get("book_name", "Unknown")
     )
-    
-    result = call_ollama(prompt, claim_data["claim_id"], "decompose")
-    
+
+
+def decompose_claim(claim_data: dict) -> List[SubClaim]:
+    """Decompose claim into sub-claims."""
+    result = call_ollama(build_decompose_prompt(claim_data),
+                         claim_data["claim_id"], "decompose")
+    return parse_sub_claims(result, claim_data)
+
+
+def parse_sub_claims(result, claim_data: dict) -> List[SubClaim]:
+    """Parse a decomposition response into SubClaim objects."""
     # Fallback if result is not a valid list
     if not result or not isinstance(result, list):
         return [SubClaim(
@@ -267,16 +425,24 @@ def decompose_claim(claim_data: dict) -> List[SubClaim]:
     return sub_claims
 
 
-def evaluate_support(claim_data: dict, evidence_text: str) -> Tuple[float, str, List[str]]:
-    """Seek supporting evidence."""
-    prompt = SUPPORT_SEEKING_PROMPT.format(
+def build_support_prompt(claim_data: dict, evidence_text: str) -> str:
+    """Build the support-seeking prompt for one claim."""
+    return SUPPORT_SEEKING_PROMPT.format(
         claim_text=claim_data["claim_text"],
         character=claim_data.get("character", "Unknown"),
         evidence_text=evidence_text
     )
-    
-    result = call_ollama(prompt, claim_data["claim_id"], "support")
-    
+
+
+def evaluate_support(claim_data: dict, evidence_text: str) -> Tuple[float, str, List[str]]:
+    """Seek supporting evidence."""
+    result = call_ollama(build_support_prompt(claim_data, evidence_text),
+                         claim_data["claim_id"], "support")
+    return parse_support(result)
+
+
+def parse_support(result) -> Tuple[float, str, List[str]]:
+    """Parse a support-seeking response."""
     if not result or not isinstance(result, dict):
         return 0.3, "Unable to analyze support", []
     
@@ -289,16 +455,24 @@ def evaluate_support(claim_data: dict, evidence_text: str) -> Tuple[float, str,
     return conf, reasoning, excerpts
 
 
-def evaluate_contradiction(claim_data: dict, evidence_text: str) -> Tuple[float, str, List[str], str]:
-    """Seek contradicting evidence (ANTI-BIAS)."""
-    prompt = CONTRADICTION_SEEKING_PROMPT.format(
+def build_contradiction_prompt(claim_data: dict, evidence_text: str) -> str:
+    """Build the contradiction-seeking prompt for one claim."""
+    return CONTRADICTION_SEEKING_PROMPT.format(
         claim_text=claim_data["claim_text"],
         character=claim_data.get("character", "Unknown"),
         evidence_text=evidence_text
     )
-    
-    result = call_ollama(prompt, claim_data["claim_id"], "contradict")
-    
+
+
+def evaluate_contradiction(claim_data: dict, evidence_text: str) -> Tuple[float, str, List[str], str]:
+    """Seek contradicting evidence (ANTI-BIAS)."""
+    result = call_ollama(build_contradiction_prompt(claim_data, evidence_text),
+                         claim_data["claim_id"], "contradict")
+    return parse_contradiction(result)
+
+
+def parse_contradiction(result) -> Tuple[float, str, List[str], str]:
+    """Parse a contradiction-seeking response."""
     if not result or not isinstance(result, dict):
         return 0.0, "Unable to analyze contradiction", [], "none"
     
@@ -356,39 +530,45 @@ def synthesize_verdict(support_conf: float, support_reason: str,
     return Verdict.SUPPORTED, confidence, reasoning
 
 
-def process_claim(claim_data: dict) -> dict:
-    """Process claim through 4-stage pipeline."""
-    claim_id = claim_data["claim_id"]
-    
-    # Stage 1: Decomposition
-    sub_claims = decompose_claim(claim_data)
-    
-    # Prepare evidence
-    evidence = claim_data.get("evidence", [])
-    evidence_text = "\n\n".join([
-        f"[{e.get('temporal_slice', 'MID')}] {e['text'][:1200]}"
+# Token budget per evidence passage. Prompt-eval time on Ollama scales
+# linearly with input tokens, so passages are clipped to a token budget
+# rather than a character count. ~4 chars/token is a close enough proxy
+# for English prose that loading a real tokenizer isn't worth the import.
+EVIDENCE_TOKEN_BUDGET = 300
+CHARS_PER_TOKEN = 4
+
+
+def clip_to_tokens(text: str, n_tok: int) -> str:
+    """Trim text to roughly n_tok tokens, breaking at a word boundary."""
+    limit = n_tok * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[:cut if cut > 0 else limit]
+
+
+def build_evidence_text(evidence: List[dict]) -> str:
+    """Format the top evidence passages for prompt interpolation."""
+    return "\n\n".join([
+        f"[{e.get('temporal_slice', 'MID')}] {clip_to_tokens(e['text'], EVIDENCE_TOKEN_BUDGET)}"
         for e in evidence[:4]
     ])
-    
-    # Stage 2: Dual-perspective evaluation
-    support_conf, support_reason, support_excerpts = evaluate_support(
-        claim_data, evidence_text
-    )
-    
-    time.sleep(0.3)
-    
-    contradict_conf, contradict_reason, contradict_excerpts, violation_type = evaluate_contradiction(
-        claim_data, evidence_text
-    )
-    
-    # Stage 3: Synthesis
+
+
+def build_verdict(claim_data: dict, sub_claims: List[SubClaim],
+                  support: Tuple[float, str, List[str]],
+                  contradiction: Tuple[float, str, List[str], str]) -> dict:
+    """Synthesize the final verdict dict from stage results."""
+    claim_id = claim_data["claim_id"]
+    support_conf, support_reason, support_excerpts = support
+    contradict_conf, contradict_reason, contradict_excerpts, violation_type = contradiction
+
     verdict, confidence, reasoning = synthesize_verdict(
         support_conf, support_reason,
         contradict_conf, contradict_reason,
         violation_type
     )
-    
-    # Build analysis
+
     analysis = ClaimAnalysis(
         claim_id=claim_id,
         claim_text=claim_data["claim_text"],
@@ -401,7 +581,7 @@ def process_claim(claim_data: dict) -> dict:
         confidence=confidence,
         reasoning=reasoning
     )
-    
+
     return {
         "claim_id": claim_id,
         "verdict": verdict.value,
@@ -413,6 +593,107 @@ def process_claim(claim_data: dict) -> dict:
     }
 
 
+def process_claim(claim_data: dict) -> dict:
+    """Process one claim through the 4-stage pipeline."""
+    sub_claims = decompose_claim(claim_data)
+    evidence_text = build_evidence_text(claim_data.get("evidence", []))
+
+    support = evaluate_support(claim_data, evidence_text)
+    contradiction = evaluate_contradiction(claim_data, evidence_text)
+
+    return build_verdict(claim_data, sub_claims, support, contradiction)
+
+
+def process_claim_batch(batch: List[dict]) -> List[dict]:
+    """Process a group of claims with one Ollama call per stage.
+
+    Shared prompt instructions are decoded once per group instead of
+    once per claim; a group of one degrades to the per-claim path.
+    """
+    if len(batch) == 1:
+        return [process_claim(batch[0])]
+
+    ids = [c["claim_id"] for c in batch]
+    evidence_texts = [build_evidence_text(c.get("evidence", [])) for c in batch]
+
+    decomp_results = call_ollama_batch(
+        [build_decompose_prompt(c) for c in batch], ids, "decompose")
+    support_results = call_ollama_batch(
+        [build_support_prompt(c, ev) for c, ev in zip(batch, evidence_texts)],
+        ids, "support")
+    contradict_results = call_ollama_batch(
+        [build_contradiction_prompt(c, ev) for c, ev in zip(batch, evidence_texts)],
+        ids, "contradict")
+
+    return [
+        build_verdict(
+            c,
+            parse_sub_claims(decomp, c),
+            parse_support(supp),
+            parse_contradiction(contra)
+        )
+        for c, decomp, supp, contra in zip(
+            batch, decomp_results, support_results, contradict_results)
+    ]
+
+
+def load_evidence() -> List[dict]:
+    """Load all evidence records: the JSONL stream plus legacy per-claim files."""
+    records = {}
+    if EVIDENCE_FILE.exists():
+        with open(EVIDENCE_FILE, "rb") as f:
+            for line in f:
+                if line.strip():
+                    record = orjson.loads(line)
+                    records[record["claim_id"]] = record
+    for evidence_file in EVIDENCE_DIR.glob("*.json"):
+        record = orjson.loads(evidence_file.read_bytes())
+        records.setdefault(record["claim_id"], record)
+    return list(records.values())
+
+
+async def process_all(remaining: List[dict]) -> dict:
+    """Run all remaining claims concurrently under a semaphore.
+
+    call_ollama stays synchronous (requests) - each claim runs on a
+    worker thread via asyncio.to_thread, which overlaps HTTP waits so
+    Ollama's server-side parallelism actually gets fed.
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT_CLAIMS)
+    stats = {"supported": 0, "contradicted": 0, "undetermined": 0}
+    done_count = 0
+    start_time = time.time()
+
+    # Claims run through the pipeline in small groups: one Ollama call
+    # per stage per group (see process_claim_batch)
+    groups = [remaining[i:i + OLLAMA_BATCH_SIZE]
+              for i in range(0, len(remaining), OLLAMA_BATCH_SIZE)]
+
+    def write_verdict(verdict: dict):
+        output_file = OUTPUT_DIR / f"{verdict['claim_id']}.json"
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(verdict, option=orjson.OPT_INDENT_2))
+
+    async def process_group(batch: List[dict]):
+        nonlocal done_count
+        async with sem:
+            # Pipeline and verdict writes run on worker threads so
+            # neither stalls the other in-flight groups
+            verdicts = await asyncio.to_thread(process_claim_batch, batch)
+
+            for verdict in verdicts:
+                await asyncio.to_thread(write_verdict, verdict)
+                stats[verdict["verdict"]] += 1
+                done_count += 1
+
+            elapsed = time.time() - start_time
+            eta = elapsed / done_count * (len(remaining) - done_count)
+            print(f"  [{done_count}/{len(remaining)}] - ETA: {eta/60:.1f}min")
+
+    await asyncio.gather(*(process_group(g) for g in groups))
+    return stats
+
+
 # ============================================================================
 # Ollama Status Check
 # ============================================================================
@@ -420,7 +701,7 @@ def process_claim(claim_data: dict) -> dict:
 def check_ollama_status() -> bool:
     """Check if Ollama is running with required model."""
     try:
-        response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
+        response = SESSION.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
         if response.status_code != 200:
             return False
         
@@ -438,6 +719,22 @@ def check_ollama_status() -> bool:
         return False
 
 
+def warm_model():
+    """Load the model into memory before the run starts.
+
+    An empty-prompt generate with keep_alive=-1 pulls the weights in
+    once, so the first real claim doesn't pay seconds of cold load.
+    """
+    try:
+        SESSION.post(
+            f"{OLLAMA_HOST}/api/generate",
+            json={"model": OLLAMA_MODEL, "keep_alive": -1},
+            timeout=180
+        )
+    except Exception as e:
+        logger.warning(f"Model warm-up failed: {e}")
+
+
 # ============================================================================
 # Main
 # ============================================================================
@@ -451,22 +748,28 @@ def main():
     
     logger.info("Starting local reasoning agent")
     
-    print(f"\nChecking Ollama at {OLLAMA_HOST}...")
-    if not check_ollama_status():
-        print("\n❌ Ollama not available!")
-        print("   1. Install: curl -fsSL https://ollama.com/install.sh | sh")
-        print(f"   2. Pull model: ollama pull {OLLAMA_MODEL}")
-        print("   3. Start: ollama serve")
-        return
-    
-    print(f"✅ Ollama running with model: {OLLAMA_MODEL}")
-    
-    evidence_files = list(EVIDENCE_DIR.glob("*.json"))
-    if not evidence_files:
-        print(f"\n❌ No evidence files in {EVIDENCE_DIR}/")
+    if LLM_BACKEND == "openai":
+        print(f"\nUsing OpenAI-compatible backend at {OPENAI_BASE_URL}")
+    else:
+        print(f"\nChecking Ollama at {OLLAMA_HOST}...")
+        if not check_ollama_status():
+            print("\n❌ Ollama not available!")
+            print("   1. Install: curl -fsSL https://ollama.com/install.sh | sh")
+            print(f"   2. Pull model: ollama pull {OLLAMA_MODEL}")
+            print("   3. Start: ollama serve")
+            return
+
+        print(f"✅ Ollama running with model: {OLLAMA_MODEL}")
+
+        print("Warming model (keep_alive=-1)...")
+        warm_model()
+
+    evidence_records = load_evidence()
+    if not evidence_records:
+        print(f"\n❌ No evidence found in {EVIDENCE_DIR}/")
         return
-    
-    print(f"Found {len(evidence_files)} evidence files")
+
+    print(f"Found {len(evidence_records)} evidence records")
     print(f"\nAnti-bias thresholds:")
     print(f"  - Contradiction: {CONTRADICTION_THRESHOLD}")
     print(f"  - Strong support: {STRONG_SUPPORT_THRESHOLD}")
@@ -474,37 +777,16 @@ def main():
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
     processed = set(f.stem for f in OUTPUT_DIR.glob("*.json"))
-    remaining = [f for f in evidence_files if f.stem not in processed]
+    remaining = [c for c in evidence_records if c["claim_id"] not in processed]
     
     if processed:
         print(f"  {len(processed)} processed, {len(remaining)} remaining")
     
     print(f"\nProcessing {len(remaining)} claims with 4-stage pipeline...")
-    
-    stats = {"supported": 0, "contradicted": 0, "undetermined": 0}
+    print(f"(up to {MAX_CONCURRENT_CLAIMS} claims in flight)\n")
+
     start_time = time.time()
-    
-    for i, evidence_file in enumerate(remaining):
-        with open(evidence_file, "r", encoding="utf-8") as f:
-            claim_data = json.load(f)
-        
-        verdict = process_claim(claim_data)
-        stats[verdict["verdict"]] += 1
-        
-        output_file = OUTPUT_DIR / f"{claim_data['claim_id']}.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(verdict, f, indent=2, ensure_ascii=False)
-        
-        elapsed = time.time() - start_time
-        avg = elapsed / (i + 1)
-        eta = avg * (len(remaining) - i - 1)
-        
-        if (i + 1) % 5 == 0 or i == len(remaining) - 1:
-            print(f"  [{i + 1}/{len(remaining)}] {verdict['verdict']} "
-                  f"(conf={verdict['confidence']:.2f}) - ETA: {eta/60:.1f}min")
-        
-        time.sleep(RATE_LIMIT_DELAY)
-    
+    stats = asyncio.run(process_all(remaining))
     total_time = time.time() - start_time
     
     print("\n" + "=" * 60)
@@ -1,284 +1,584 @@
-"""
-NovelVerified.AI - Flask Backend API
-
-Serves results and dossiers to the React frontend.
-
-Endpoints:
-    GET /api/results - Get all results as JSON
-    GET /api/dossier/<claim_id> - Get dossier markdown
-    GET /download/results.csv - Download results as CSV file
-"""
-
-import os
-import json
-import csv
-from pathlib import Path
-from flask import Flask, jsonify, send_file, request, abort
-from flask_cors import CORS
-from dotenv import load_dotenv
-
-# Load environment
-load_dotenv()
-
-# Configuration
-HOST = os.getenv("FLASK_HOST", "127.0.0.1")
-PORT = int(os.getenv("FLASK_PORT", 5000))
-DEBUG = os.getenv("FLASK_DEBUG", "true").lower() == "true"
-
-# Paths (relative to project root)
-PROJECT_ROOT = Path(__file__).parent.parent
-RESULTS_FILE = PROJECT_ROOT / "output" / "results.csv"  # NovelVerified.AI submission format
-RESULTS_EXTENDED = PROJECT_ROOT / "output" / "results_extended.csv"  # Dashboard format
-DOSSIERS_DIR = PROJECT_ROOT / "dossiers"
-VERDICTS_DIR = PROJECT_ROOT / "verdicts"
-EVIDENCE_DIR = PROJECT_ROOT / "evidence"
-
-# Initialize Flask app
-app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend
-
-# Register blueprints (handle both direct execution and test imports)
-try:
-    from flask_api.upload import upload_bp
-    from flask_api.history import history_bp
-    from flask_api.claims import claims_bp
-    from flask_api.pipeline_api import pipeline_bp
-except ImportError:
-    from upload import upload_bp
-    from history import history_bp
-    from claims import claims_bp
-    from pipeline_api import pipeline_bp
-
-app.register_blueprint(upload_bp)
-app.register_blueprint(history_bp)
-app.register_blueprint(claims_bp)
-app.register_blueprint(pipeline_bp)
-
-
-@app.route("/api/results", methods=["GET"])
-def get_results():
-    """Return all results as JSON (uses extended format for dashboard)."""
-    # Use extended results for dashboard
-    results_file = RESULTS_EXTENDED if RESULTS_EXTENDED.exists() else RESULTS_FILE
-    
-    if not results_file.exists():
-        return jsonify({"error": "Results file not found. Run the pipeline first."}), 404
-    
-    results = []
-    with open(results_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Normalize field names for frontend compatibility
-            normalized = {
-                "id": row.get("Story ID", row.get("id", "")),
-                "prediction": int(row.get("Prediction", row.get("prediction", 0))),
-                "rationale": row.get("Rationale", row.get("rationale", "")),
-                "book_name": row.get("book_name", ""),
-                "character": row.get("character", ""),
-                "verdict": row.get("verdict", ""),
-                "confidence": float(row.get("confidence", 0)),
-            }
-            results.append(normalized)
-    
-    return jsonify({
-        "total": len(results),
-        "results": results
-    })
-
-
-@app.route("/api/dossier/<claim_id>", methods=["GET"])
-def get_dossier(claim_id: str):
-    """Return dossier markdown for a specific claim."""
-    dossier_file = DOSSIERS_DIR / f"{claim_id}.md"
-    
-    if not dossier_file.exists():
-        return jsonify({"error": f"Dossier not found for claim {claim_id}"}), 404
-    
-    with open(dossier_file, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    return jsonify({
-        "claim_id": claim_id,
-        "content": content
-    })
-
-
-@app.route("/api/verdict/<claim_id>", methods=["GET"])
-def get_verdict(claim_id: str):
-    """Return raw verdict JSON for a specific claim."""
-    verdict_file = VERDICTS_DIR / f"{claim_id}.json"
-    
-    if not verdict_file.exists():
-        return jsonify({"error": f"Verdict not found for claim {claim_id}"}), 404
-    
-    with open(verdict_file, "r", encoding="utf-8") as f:
-        verdict = json.load(f)
-    
-    return jsonify(verdict)
-
-
-@app.route("/api/evidence/<claim_id>", methods=["GET"])
-def get_evidence(claim_id: str):
-    """Return evidence data for a specific claim."""
-    evidence_file = EVIDENCE_DIR / f"{claim_id}.json"
-    
-    if not evidence_file.exists():
-        return jsonify({"error": f"Evidence not found for claim {claim_id}"}), 404
-    
-    with open(evidence_file, "r", encoding="utf-8") as f:
-        evidence = json.load(f)
-    
-    return jsonify(evidence)
-
-
-@app.route("/api/stats", methods=["GET"])
-def get_stats():
-    """Return summary statistics including model accuracy."""
-    # Use extended results for stats
-    results_file = RESULTS_EXTENDED if RESULTS_EXTENDED.exists() else RESULTS_FILE
-    
-    if not results_file.exists():
-        return jsonify({"error": "Results file not found"}), 404
-    
-    results = []
-    with open(results_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            results.append(row)
-    
-    # Load ground truth labels from claims
-    claims_file = PROJECT_ROOT / "claims" / "claims.jsonl"
-    ground_truth = {}
-    if claims_file.exists():
-        with open(claims_file, "r", encoding="utf-8") as f:
-            for line in f:
-                claim = json.loads(line)
-                claim_id = str(claim.get("id"))
-                label = claim.get("label", "").lower()
-                # Map labels: consistent -> 1, contradictory -> 0
-                if label in ["consistent", "supported"]:
-                    ground_truth[claim_id] = 1
-                elif label in ["contradictory", "contradicted"]:
-                    ground_truth[claim_id] = 0
-    
-    # Calculate stats (handle both old and new column names)
-    total = len(results)
-    supported = sum(1 for r in results if int(r.get("Prediction", r.get("prediction", 0))) == 1)
-    contradicted = total - supported
-    
-    # Calculate accuracy (only for claims with ground truth)
-    correct = 0
-    evaluated = 0
-    for r in results:
-        claim_id = str(r.get("Story ID", r.get("id", "")))
-        prediction = int(r.get("Prediction", r.get("prediction", 0)))
-        if claim_id in ground_truth:
-            evaluated += 1
-            if prediction == ground_truth[claim_id]:
-                correct += 1
-    
-    accuracy = round((correct / evaluated * 100), 2) if evaluated > 0 else None
-    
-    # Breakdown by book
-    books = {}
-    for r in results:
-        book = r.get("book_name", "Unknown")
-        if book not in books:
-            books[book] = {"total": 0, "supported": 0, "contradicted": 0}
-        books[book]["total"] += 1
-        if int(r.get("Prediction", r.get("prediction", 0))) == 1:
-            books[book]["supported"] += 1
-        else:
-            books[book]["contradicted"] += 1
-    
-    # Breakdown by verdict
-    verdicts = {}
-    for r in results:
-        v = r.get("verdict", "unknown")
-        verdicts[v] = verdicts.get(v, 0) + 1
-    
-    # Average confidence
-    avg_confidence = sum(float(r.get("confidence", 0)) for r in results) / total if total > 0 else 0
-    
-    return jsonify({
-        "total": total,
-        "supported": supported,
-        "contradicted": contradicted,
-        "accuracy": accuracy,
-        "evaluated_claims": evaluated,
-        "correct_predictions": correct,
-        "by_book": books,
-        "by_verdict": verdicts,
-        "avg_confidence": round(avg_confidence, 3)
-    })
-
-
-@app.route("/download/results.csv", methods=["GET"])
-def download_results():
-    """Download results CSV file."""
-    if not RESULTS_FILE.exists():
-        return jsonify({"error": "Results file not found"}), 404
-    
-    return send_file(
-        str(RESULTS_FILE),
-        mimetype="text/csv",
-        as_attachment=True,
-        download_name="results.csv"
-    )
-
-
-@app.route("/api/books", methods=["GET"])
-def get_books():
-    """Return list of unique books."""
-    if not RESULTS_FILE.exists():
-        return jsonify({"books": []})
-    
-    books = set()
-    with open(RESULTS_FILE, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            books.add(row.get("book_name", ""))
-    
-    return jsonify({"books": sorted(list(books))})
-
-
-@app.route("/api/characters", methods=["GET"])
-def get_characters():
-    """Return list of unique characters."""
-    if not RESULTS_FILE.exists():
-        return jsonify({"characters": []})
-    
-    characters = set()
-    with open(RESULTS_FILE, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            characters.add(row.get("character", ""))
-    
-    return jsonify({"characters": sorted(list(characters))})
-
-
-@app.route("/", methods=["GET"])
-def index():
-    """API info endpoint."""
-    return jsonify({
-        "name": "NovelVerified.AI API",
-        "version": "1.1.0",
-        "endpoints": {
-            "/api/results": "GET all results",
-            "/api/dossier/<id>": "GET dossier markdown",
-            "/api/verdict/<id>": "GET verdict JSON",
-            "/api/evidence/<id>": "GET evidence JSON",
-            "/api/stats": "GET summary statistics",
-            "/api/books": "GET list of books",
-            "/api/characters": "GET list of characters",
-            "/api/upload": "POST upload novel (PDF/DOCX/TXT)",
-            "/api/novels": "GET list of uploaded novels",
-            "/api/pipeline/run": "POST trigger pipeline",
-            "/download/results.csv": "Download CSV file"
-        }
-    })
-
-
-if __name__ == "__main__":
-    print(f"Starting NovelVerified.AI API on http://{HOST}:{PORT}")
-    app.run(host=HOST, port=PORT, debug=DEBUG)
+"""
+NovelVerified.AI - Flask Backend API
+
+Serves results and dossiers to the React frontend.
+
+Endpoints:
+    GET /api/results - Get all results as JSON
+    GET /api/dossier/<claim_id> - Get dossier markdown
+    GET /download/results.csv - Download results as CSV file
+"""
+
+import gzip
+import os
+import json
+import re
+import orjson
+import shutil
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
+from flask import Flask, Response, jsonify, send_file, request, abort
+from flask.json.provider import DefaultJSONProvider
+from flask_cors import CORS
+from dotenv import load_dotenv
+
+# Load environment
+load_dotenv()
+
+# Configuration
+HOST = os.getenv("FLASK_HOST", "127.0.0.1")
+PORT = int(os.getenv("FLASK_PORT", 5000))
+DEBUG = os.getenv("FLASK_DEBUG", "true").lower() == "true"
+
+# Claim ids are interpolated into filesystem paths; anything outside
+# this shape (path separators, dots-runs, oversized junk from scrapers)
+# is rejected in constant time before any stat() happens
+CLAIM_ID_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def valid_claim_id(claim_id: str) -> bool:
+    """Cheap whitelist check for claim-id path parameters."""
+    return CLAIM_ID_RE.match(claim_id) is not None
+
+
+def etag_for(*paths) -> str:
+    """Weak ETag value derived from each file's (mtime, size)."""
+    parts = []
+    for path in paths:
+        try:
+            st = path.stat()
+            parts.append(f"{st.st_mtime_ns:x}-{st.st_size:x}")
+        except FileNotFoundError:
+            parts.append("0")
+    return "-".join(parts)
+
+
+def not_modified(tag: str):
+    """Return a 304 response if the client already holds this ETag."""
+    if request.if_none_match.contains_weak(tag):
+        return Response(status=304)
+    return None
+
+
+# Paths (relative to project root)
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_FILE = PROJECT_ROOT / "output" / "results.csv"  # NovelVerified.AI submission format
+RESULTS_EXTENDED = PROJECT_ROOT / "output" / "results_extended.csv"  # Dashboard format
+DOSSIERS_DIR = PROJECT_ROOT / "dossiers"
+VERDICTS_DIR = PROJECT_ROOT / "verdicts"
+VERDICTS_FILE = VERDICTS_DIR / "verdicts.jsonl"
+EVIDENCE_DIR = PROJECT_ROOT / "evidence"
+EVIDENCE_FILE = EVIDENCE_DIR / "evidence.jsonl"
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    jsonify on the results list is the API's hottest serialization;
+    orjson encodes it in native code, so every endpoint gets the faster
+    encoder without touching handler code.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(
+            obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Initialize Flask app
+app = Flask(__name__)
+app.json = OrjsonProvider(app)
+CORS(app)  # Enable CORS for frontend
+
+# Register blueprints (handle both direct execution and test imports)
+try:
+    from flask_api.upload import upload_bp, MAX_FILE_SIZE
+    from flask_api.history import history_bp
+    from flask_api.claims import claims_bp
+    from flask_api.pipeline_api import pipeline_bp
+except ImportError:
+    from upload import upload_bp, MAX_FILE_SIZE
+    from history import history_bp
+    from claims import claims_bp
+    from pipeline_api import pipeline_bp
+
+# Werkzeug drops over-limit request bodies at the socket layer (413)
+# before any handler code runs
+app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
+
+app.register_blueprint(upload_bp)
+app.register_blueprint(history_bp)
+app.register_blueprint(claims_bp)
+app.register_blueprint(pipeline_bp)
+
+
+# Transparent gzip for large JSON bodies. Compressed bytes are cached
+# by ETag, so for an unchanged data version repeat requests skip both
+# the JSON build (handler-level caches) and the deflate pass here.
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+_GZIP_CACHE_MAX = 32
+_GZIP_CACHE = {}
+
+
+@app.after_request
+def compress_json(response):
+    """Gzip JSON responses over COMPRESS_MIN_SIZE when the client asks."""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.mimetype != "application/json"
+            or "Content-Encoding" in response.headers
+            or "gzip" not in request.accept_encodings):
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+
+    tag, _ = response.get_etag()
+    compressed = _GZIP_CACHE.get(tag) if tag else None
+    if compressed is None:
+        compressed = gzip.compress(body, COMPRESS_LEVEL)
+        if tag:
+            if len(_GZIP_CACHE) >= _GZIP_CACHE_MAX:
+                _GZIP_CACHE.pop(next(iter(_GZIP_CACHE)))
+            _GZIP_CACHE[tag] = compressed
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = "gzip"
+    response.headers.add("Vary", "Accept-Encoding")
+    return response
+
+
+# Per-claim record index over the JSONL bundles the agents write
+# (verdicts.jsonl, evidence.jsonl): claim_id -> raw line bytes, rebuilt
+# only when the file's (mtime_ns, size) changes
+_JSONL_INDEX_CACHE = {}
+
+
+def jsonl_record(jsonl_file: Path, claim_id: str):
+    """Return one record's raw JSON bytes from a JSONL file, or None."""
+    try:
+        st = jsonl_file.stat()
+    except FileNotFoundError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _JSONL_INDEX_CACHE.get(jsonl_file)
+    if cached is None or cached[0] != key:
+        index = {}
+        with open(jsonl_file, "rb") as f:
+            for line in f:
+                if line.strip():
+                    index[str(orjson.loads(line)["claim_id"])] = line
+        cached = (key, index)
+        _JSONL_INDEX_CACHE[jsonl_file] = cached
+    return cached[1].get(claim_id)
+
+
+# Parsed-results cache: /api/results, /api/stats, /api/books and
+# /api/characters all read the same CSV, so one parse serves them all
+# and repeat requests cost a stat() until the pipeline rewrites the file
+_RESULTS_CACHE = {"key": None, "rows": None, "table": None}
+
+
+def read_results_rows(results_file: Path) -> list:
+    """Parse a results CSV into normalized row dicts.
+
+    pyarrow.csv parses in native code with multithreaded chunking -
+    orders of magnitude faster than csv.DictReader's per-row dict
+    construction. Handles both the submission-format column names
+    (Story ID/Prediction/Rationale) and the lowercase extended ones.
+    Parses are cached keyed on (path, mtime, size).
+    """
+    st = results_file.stat()
+    key = (str(results_file), st.st_mtime_ns, st.st_size)
+    if _RESULTS_CACHE["key"] == key:
+        return _RESULTS_CACHE["rows"]
+
+    # Prefer the pipeline's Feather sibling when it's current: a
+    # memory-mapped columnar read with no text-to-type parsing at all
+    arrow_file = results_file.parent / "results.arrow"
+    if (arrow_file.exists()
+            and arrow_file.stat().st_mtime_ns >= st.st_mtime_ns):
+        table = feather.read_table(str(arrow_file), memory_map=True)
+    else:
+        table = pacsv.read_csv(str(results_file))
+    names = set(table.column_names)
+    n = len(table)
+
+    def column(*candidates, default=""):
+        for name in candidates:
+            if name in names:
+                return table[name].to_pylist()
+        return [default] * n
+
+    ids = column("Story ID", "id")
+    predictions = column("Prediction", "prediction", default=0)
+    rationales = column("Rationale", "rationale")
+    books = column("book_name")
+    characters = column("character")
+    verdicts = column("verdict")
+    confidences = column("confidence", default=0)
+
+    rows = [
+        {
+            "id": str(ids[i]) if ids[i] is not None else "",
+            "prediction": int(predictions[i] or 0),
+            "rationale": rationales[i] or "",
+            "book_name": books[i] or "",
+            "character": characters[i] or "",
+            "verdict": verdicts[i] or "",
+            "confidence": float(confidences[i] or 0),
+        }
+        for i in range(n)
+    ]
+    _RESULTS_CACHE["key"] = key
+    _RESULTS_CACHE["rows"] = rows
+    # Columnar twin of the same data for pyarrow.compute aggregations
+    _RESULTS_CACHE["table"] = pa.table({
+        "id": [r["id"] for r in rows],
+        "prediction": pa.array([r["prediction"] for r in rows], pa.int64()),
+        "book_name": [r["book_name"] for r in rows],
+        "verdict": [r["verdict"] for r in rows],
+        "confidence": pa.array([r["confidence"] for r in rows], pa.float64()),
+    })
+    return rows
+
+
+def read_results_table(results_file: Path) -> pa.Table:
+    """Normalized results as an Arrow table (same cache as the rows)."""
+    read_results_rows(results_file)
+    return _RESULTS_CACHE["table"]
+
+
+# Ground-truth labels rarely change between requests; same mtime-keyed
+# caching as the results parse
+_GROUND_TRUTH_CACHE = {"key": None, "labels": None}
+
+# Serialized /api/stats payload, keyed on the results + ground-truth
+# cache keys so it rolls whenever either input changes
+_STATS_CACHE = {"key": None, "body": None}
+
+
+def load_ground_truth() -> dict:
+    """Map claim id -> 0/1 label from claims.jsonl, cached on mtime."""
+    claims_file = PROJECT_ROOT / "claims" / "claims.jsonl"
+    if not claims_file.exists():
+        return {}
+    st = claims_file.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    if _GROUND_TRUTH_CACHE["key"] == key:
+        return _GROUND_TRUTH_CACHE["labels"]
+
+    ground_truth = {}
+    for line in claims_file.read_bytes().splitlines():
+        if not line:
+            continue
+        claim = orjson.loads(line)
+        claim_id = str(claim.get("id"))
+        label = (claim.get("label") or "").lower()
+        # Map labels: consistent -> 1, contradictory -> 0
+        if label in ("consistent", "supported"):
+            ground_truth[claim_id] = 1
+        elif label in ("contradictory", "contradicted"):
+            ground_truth[claim_id] = 0
+
+    _GROUND_TRUTH_CACHE["key"] = key
+    _GROUND_TRUTH_CACHE["labels"] = ground_truth
+    return ground_truth
+
+
+@app.route("/api/results", methods=["GET"])
+def get_results():
+    """Return all results as JSON (uses extended format for dashboard)."""
+    # Use extended results for dashboard
+    results_file = RESULTS_EXTENDED if RESULTS_EXTENDED.exists() else RESULTS_FILE
+    
+    if not results_file.exists():
+        return jsonify({"error": "Results file not found. Run the pipeline first."}), 404
+
+    # Serve a pre-serialized JSON sibling of the CSV: the response body
+    # goes straight from disk through send_file (sendfile(2) under a
+    # real WSGI server), and conditional=True gives clients
+    # Last-Modified/304 and range support for free. The sibling is
+    # rebuilt lazily whenever the CSV is newer.
+    json_file = results_file.with_suffix(".json")
+    if (not json_file.exists()
+            or json_file.stat().st_mtime_ns < results_file.stat().st_mtime_ns):
+        results = read_results_rows(results_file)
+        json_file.write_bytes(orjson.dumps(
+            {"total": len(results), "results": results}))
+
+    return send_file(json_file, mimetype="application/json",
+                     conditional=True)
+
+
+@app.route("/api/dossier/<claim_id>", methods=["GET"])
+def get_dossier(claim_id: str):
+    """Return dossier markdown for a specific claim."""
+    if not valid_claim_id(claim_id):
+        return jsonify({"error": f"Dossier not found for claim {claim_id}"}), 404
+
+    dossier_file = DOSSIERS_DIR / f"{claim_id}.md"
+    
+    if not dossier_file.exists():
+        return jsonify({"error": f"Dossier not found for claim {claim_id}"}), 404
+
+    # ?raw=1 hands the markdown straight to the WSGI file wrapper
+    # (sendfile on Linux) instead of copying it through a JSON envelope
+    if request.args.get("raw") == "1":
+        return send_file(str(dossier_file),
+                         mimetype="text/markdown; charset=utf-8",
+                         conditional=True)
+
+    tag = etag_for(dossier_file)
+    response_304 = not_modified(tag)
+    if response_304 is not None:
+        return response_304
+
+    response = jsonify({
+        "claim_id": claim_id,
+        "content": dossier_file.read_text(encoding="utf-8")
+    })
+    response.set_etag(tag, weak=True)
+    return response
+
+
+@app.route("/api/verdict/<claim_id>", methods=["GET"])
+def get_verdict(claim_id: str):
+    """Return raw verdict JSON for a specific claim."""
+    if not valid_claim_id(claim_id):
+        return jsonify({"error": f"Verdict not found for claim {claim_id}"}), 404
+
+    verdict_file = VERDICTS_DIR / f"{claim_id}.json"
+
+    if verdict_file.exists():
+        # The stored file is already the response JSON - serve it
+        # straight from disk instead of parsing and re-serializing it
+        return send_file(str(verdict_file), mimetype="application/json",
+                         conditional=True)
+
+    # Cloud runs write a single verdicts.jsonl instead of per-claim
+    # files; serve the record's raw bytes from the cached index
+    record = jsonl_record(VERDICTS_FILE, claim_id)
+    if record is None:
+        return jsonify({"error": f"Verdict not found for claim {claim_id}"}), 404
+    return Response(record, mimetype="application/json")
+
+
+@app.route("/api/evidence/<claim_id>", methods=["GET"])
+def get_evidence(claim_id: str):
+    """Return evidence data for a specific claim."""
+    if not valid_claim_id(claim_id):
+        return jsonify({"error": f"Evidence not found for claim {claim_id}"}), 404
+
+    evidence_file = EVIDENCE_DIR / f"{claim_id}.json"
+
+    if evidence_file.exists():
+        return send_file(str(evidence_file), mimetype="application/json",
+                         conditional=True)
+
+    # Fresh retrieval runs only write evidence.jsonl; look the claim up
+    # in the cached index
+    record = jsonl_record(EVIDENCE_FILE, claim_id)
+    if record is None:
+        return jsonify({"error": f"Evidence not found for claim {claim_id}"}), 404
+    return Response(record, mimetype="application/json")
+
+
+@app.route("/api/stats", methods=["GET"])
+def get_stats():
+    """Return summary statistics including model accuracy."""
+    # Use extended results for stats
+    results_file = RESULTS_EXTENDED if RESULTS_EXTENDED.exists() else RESULTS_FILE
+    
+    if not results_file.exists():
+        return jsonify({"error": "Results file not found"}), 404
+
+    # Polling clients revalidate with If-None-Match and get a bodyless
+    # 304 before any parsing happens
+    tag = etag_for(results_file, PROJECT_ROOT / "claims" / "claims.jsonl")
+    cached_304 = not_modified(tag)
+    if cached_304 is not None:
+        return cached_304
+
+    t = read_results_table(results_file)
+
+    # Load ground truth labels from claims
+    ground_truth = load_ground_truth()
+
+    # Stats only change when results or labels do; serve the cached
+    # serialized payload whenever both inputs' cache keys still match
+    stats_key = (_RESULTS_CACHE["key"], _GROUND_TRUTH_CACHE["key"])
+    if _STATS_CACHE["key"] == stats_key:
+        response = Response(_STATS_CACHE["body"], mimetype="application/json",
+                            headers={"Cache-Control": "public, max-age=60"})
+        response.set_etag(tag, weak=True)
+        return response
+    
+    # Aggregations run as Arrow kernels over contiguous columns instead
+    # of four separate Python passes over row dicts
+    total = len(t)
+    is_supported = pc.cast(pc.equal(t["prediction"], 1), pa.int64())
+    supported = pc.sum(is_supported).as_py() or 0
+    contradicted = total - supported
+    
+    # Calculate accuracy (only for claims with ground truth)
+    correct = 0
+    evaluated = 0
+    for claim_id, prediction in zip(t["id"].to_pylist(),
+                                    t["prediction"].to_pylist()):
+        if claim_id in ground_truth:
+            evaluated += 1
+            if prediction == ground_truth[claim_id]:
+                correct += 1
+    
+    accuracy = round((correct / evaluated * 100), 2) if evaluated > 0 else None
+    
+    # Breakdown by book
+    book_names = pc.if_else(
+        pc.equal(t["book_name"], ""), pa.scalar("Unknown"), t["book_name"])
+    by_book = (pa.table({"book": book_names, "supported": is_supported})
+               .group_by("book")
+               .aggregate([("supported", "sum"), ("supported", "count")]))
+    books = {
+        book: {"total": count, "supported": int(s),
+               "contradicted": count - int(s)}
+        for book, s, count in zip(by_book["book"].to_pylist(),
+                                  by_book["supported_sum"].to_pylist(),
+                                  by_book["supported_count"].to_pylist())
+    }
+    
+    # Breakdown by verdict
+    verdict_names = pc.if_else(
+        pc.equal(t["verdict"], ""), pa.scalar("unknown"), t["verdict"])
+    by_verdict = (pa.table({"verdict": verdict_names})
+                  .group_by("verdict").aggregate([("verdict", "count")]))
+    verdicts = dict(zip(by_verdict["verdict"].to_pylist(),
+                        by_verdict["verdict_count"].to_pylist()))
+    
+    # Average confidence
+    avg_confidence = (pc.mean(t["confidence"]).as_py() or 0) if total > 0 else 0
+    
+    body = orjson.dumps({
+        "total": total,
+        "supported": supported,
+        "contradicted": contradicted,
+        "accuracy": accuracy,
+        "evaluated_claims": evaluated,
+        "correct_predictions": correct,
+        "by_book": books,
+        "by_verdict": verdicts,
+        "avg_confidence": round(avg_confidence, 3)
+    })
+    _STATS_CACHE["key"] = stats_key
+    _STATS_CACHE["body"] = body
+    response = Response(body, mimetype="application/json",
+                        headers={"Cache-Control": "public, max-age=60"})
+    response.set_etag(tag, weak=True)
+    return response
+
+
+@app.route("/download/results.csv", methods=["GET"])
+def download_results():
+    """Download results CSV file."""
+    if not RESULTS_FILE.exists():
+        return jsonify({"error": "Results file not found"}), 404
+
+    # CSV compresses 5-10x; keep a gzipped sibling for clients that
+    # accept it, rebuilt lazily when the CSV changes. conditional=True
+    # adds ETag/Last-Modified so refreshes come back as 304s.
+    if "gzip" in request.accept_encodings:
+        gz_file = RESULTS_FILE.with_suffix(".csv.gz")
+        if (not gz_file.exists()
+                or gz_file.stat().st_mtime_ns < RESULTS_FILE.stat().st_mtime_ns):
+            with open(RESULTS_FILE, "rb") as src:
+                with gzip.open(gz_file, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst)
+        response = send_file(
+            str(gz_file),
+            mimetype="text/csv",
+            as_attachment=True,
+            download_name="results.csv",
+            conditional=True
+        )
+        response.headers["Content-Encoding"] = "gzip"
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    return send_file(
+        str(RESULTS_FILE),
+        mimetype="text/csv",
+        as_attachment=True,
+        download_name="results.csv",
+        conditional=True
+    )
+
+
+@app.route("/api/books", methods=["GET"])
+def get_books():
+    """Return list of unique books."""
+    if not RESULTS_FILE.exists():
+        return jsonify({"books": []})
+    
+    tag = etag_for(RESULTS_FILE)
+    response_304 = not_modified(tag)
+    if response_304 is not None:
+        return response_304
+
+    books = set(r["book_name"] for r in read_results_rows(RESULTS_FILE))
+
+    response = jsonify({"books": sorted(books)})
+    response.set_etag(tag, weak=True)
+    return response
+
+
+@app.route("/api/characters", methods=["GET"])
+def get_characters():
+    """Return list of unique characters."""
+    if not RESULTS_FILE.exists():
+        return jsonify({"characters": []})
+    
+    tag = etag_for(RESULTS_FILE)
+    response_304 = not_modified(tag)
+    if response_304 is not None:
+        return response_304
+
+    characters = set(r["character"] for r in read_results_rows(RESULTS_FILE))
+
+    response = jsonify({"characters": sorted(characters)})
+    response.set_etag(tag, weak=True)
+    return response
+
+
+@app.route("/", methods=["GET"])
+def index():
+    """API info endpoint."""
+    return jsonify({
+        "name": "NovelVerified.AI API",
+        "version": "1.1.0",
+        "endpoints": {
+            "/api/results": "GET all results",
+            "/api/dossier/<id>": "GET dossier markdown",
+            "/api/verdict/<id>": "GET verdict JSON",
+            "/api/evidence/<id>": "GET evidence JSON",
+            "/api/stats": "GET summary statistics",
+            "/api/books": "GET list of books",
+            "/api/characters": "GET list of characters",
+            "/api/upload": "POST upload novel (PDF/DOCX/TXT)",
+            "/api/novels": "GET list of uploaded novels",
+            "/api/pipeline/run": "POST trigger pipeline",
+            "/download/results.csv": "Download CSV file"
+        }
+    })
+
+
+if __name__ == "__main__":
+    print(f"Starting NovelVerified.AI API on http://{HOST}:{PORT}")
+    app.run(host=HOST, port=PORT, debug=DEBUG)
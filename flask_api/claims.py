@@ -8,6 +8,14 @@ Claims are stored in data/train.csv for pipeline processing.
 import csv
 import os
 from pathlib import Path
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 from flask import Blueprint, request, jsonify
 import logging
 
@@ -19,6 +27,7 @@ PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 TRAIN_CSV = DATA_DIR / "train.csv"
 CURRENT_NOVEL_FILE = DATA_DIR / ".current_novel"
+MAX_ID_FILE = DATA_DIR / ".claims_max_id"
 
 CSV_HEADER = ["id", "book_name", "char", "caption", "content", "label"]
 
@@ -36,10 +45,21 @@ def set_current_novel(novel_name):
 
 
 def get_next_id():
-    """Get the next available claim ID."""
+    """Get the next available claim ID.
+
+    Reads the persistent counter file - a single tiny read instead of
+    re-scanning every train.csv row per insert. Falls back to one
+    seeding scan if the counter is missing or corrupt.
+    """
+    if MAX_ID_FILE.exists():
+        try:
+            return int(MAX_ID_FILE.read_text()) + 1
+        except ValueError:
+            pass
+
     if not TRAIN_CSV.exists():
         return 1
-    
+
     max_id = 0
     with open(TRAIN_CSV, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -52,18 +72,25 @@ def get_next_id():
     return max_id + 1
 
 
+def set_max_id(claim_id):
+    """Persist the highest assigned claim ID."""
+    MAX_ID_FILE.write_text(str(claim_id))
+
+
 def load_claims(novel_filter=None):
-    """Load claims, optionally filtered by novel name."""
+    """Load claims, optionally filtered by novel name.
+
+    The novel filter runs as a vectorized Arrow predicate over the
+    book_name column; only the surviving rows are materialized as
+    Python dicts.
+    """
     if not TRAIN_CSV.exists():
         return []
-    
-    claims = []
-    with open(TRAIN_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if novel_filter is None or row.get('book_name') == novel_filter:
-                claims.append(row)
-    return claims
+
+    table = pacsv.read_csv(str(TRAIN_CSV))
+    if novel_filter is not None:
+        table = table.filter(pc.equal(table["book_name"], novel_filter))
+    return table.to_pylist()
 
 
 def save_claims(claims):
@@ -79,6 +106,7 @@ def init_empty_csv():
     with open(TRAIN_CSV, 'w', encoding='utf-8', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=CSV_HEADER)
         writer.writeheader()
+    MAX_ID_FILE.unlink(missing_ok=True)
 
 
 @claims_bp.route('/api/claims', methods=['GET'])
@@ -122,7 +150,6 @@ def add_claim():
     
     # Create new claim
     claim = {
-        'id': get_next_id(),
         'book_name': book_name,
         'char': data['char'],
         'caption': data.get('caption', ''),
@@ -130,13 +157,19 @@ def add_claim():
         'label': data['label']
     }
     
-    # Append to file
-    file_exists = TRAIN_CSV.exists()
+    # One open does it all: the exclusive lock makes the counter
+    # read-modify-write safe against concurrent POSTs, tell()==0 detects
+    # a fresh file for the header, and the row goes out through a plain
+    # csv.writer without DictWriter's per-field dict lookups
     with open(TRAIN_CSV, 'a', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADER)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(claim)
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        claim['id'] = get_next_id()
+        writer = csv.writer(f)
+        if f.tell() == 0:
+            writer.writerow(CSV_HEADER)
+        writer.writerow([claim[field] for field in CSV_HEADER])
+        set_max_id(claim['id'])
     
     logger.info(f"Added claim {claim['id']} for {book_name}")
     
@@ -149,15 +182,20 @@ def add_claim():
 @claims_bp.route('/api/claims/<int:claim_id>', methods=['DELETE'])
 def delete_claim(claim_id):
     """Delete a specific claim by ID."""
-    claims = load_claims()
-    original_count = len(claims)
-    
-    claims = [c for c in claims if int(c.get('id', 0)) != claim_id]
-    
-    if len(claims) == original_count:
+    if not TRAIN_CSV.exists():
         return jsonify({'error': f'Claim {claim_id} not found'}), 404
-    
-    save_claims(claims)
+
+    # Read, filter and rewrite entirely in Arrow - no per-row Python
+    # dicts on either direction of the round-trip
+    table = pacsv.read_csv(str(TRAIN_CSV))
+    mask = pc.fill_null(
+        pc.not_equal(pc.cast(table["id"], pa.int64()), claim_id), True)
+    filtered = table.filter(mask)
+
+    if filtered.num_rows == table.num_rows:
+        return jsonify({'error': f'Claim {claim_id} not found'}), 404
+
+    pacsv.write_csv(filtered, str(TRAIN_CSV))
     
     return jsonify({
         'success': True,
@@ -6,11 +6,15 @@ Supports comparing Claude API vs Local Ollama model results.
 """
 
 import json
+import orjson
 import shutil
 import os
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,21 +29,108 @@ RUNS_FILE = HISTORY_DIR / "runs.json"
 HISTORY_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Parsed runs.json cache keyed on (mtime, size); save_runs rewrites the
+# file, which rolls the key and invalidates this on the next load
+_RUNS_CACHE = {"key": None, "runs": None, "by_id": None}
+
+# Verdict/dossier snapshots can be thousands of files; they run on this
+# pool so POST /api/runs/save returns as soon as the metadata is durable
+_SNAPSHOT_EXECUTOR = ThreadPoolExecutor(max_workers=2,
+                                        thread_name_prefix="run-snapshot")
+_PENDING_SNAPSHOTS = {}
+
+
 def load_runs():
     """Load runs metadata from JSON file."""
     if not RUNS_FILE.exists():
         return []
     try:
-        with open(RUNS_FILE, 'r') as f:
-            return json.load(f)
-    except:
+        st = RUNS_FILE.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        if _RUNS_CACHE["key"] == key:
+            return _RUNS_CACHE["runs"]
+        runs = orjson.loads(RUNS_FILE.read_bytes())
+        _RUNS_CACHE["key"] = key
+        _RUNS_CACHE["runs"] = runs
+        _RUNS_CACHE["by_id"] = {r['id']: r for r in runs}
+        return runs
+    except (FileNotFoundError, orjson.JSONDecodeError):
         return []
 
 
+def load_runs_by_id():
+    """Dict view of the runs list for O(1) id lookups."""
+    runs = load_runs()
+    if _RUNS_CACHE["runs"] is runs and _RUNS_CACHE["by_id"] is not None:
+        return _RUNS_CACHE["by_id"]
+    return {r['id']: r for r in runs}
+
+
 def save_runs(runs):
-    """Save runs metadata to JSON file."""
-    with open(RUNS_FILE, 'w') as f:
-        json.dump(runs, f, indent=2, default=str)
+    """Save runs metadata to JSON file atomically."""
+    # Write-then-rename: a crash mid-write can't leave a truncated
+    # runs.json behind, and readers always see a complete file
+    tmp = RUNS_FILE.with_suffix('.json.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(orjson.dumps(runs, option=orjson.OPT_INDENT_2, default=str))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, RUNS_FILE)
+
+
+def copy_file_kernel(src, dst):
+    """Copy src to dst through the kernel without a userspace buffer.
+
+    copy_file_range moves the bytes inside the kernel (reflinking on
+    filesystems that support it); shutil.copyfile remains the fallback
+    for platforms or filesystem pairs where the syscall is unavailable.
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copyfile(src, dst)
+        return
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                moved = os.copy_file_range(
+                    fsrc.fileno(), fdst.fileno(), remaining)
+                if moved == 0:
+                    break
+                remaining -= moved
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def snapshot_files(src_dir, dst_dir, suffix):
+    """Snapshot matching files from src_dir into dst_dir.
+
+    scandir's dirent data skips a stat() per entry, and same-filesystem
+    snapshots hard-link instead of copying - no bytes move at all. The
+    cross-device fallback copies through the kernel.
+    """
+    dst_dir.mkdir(exist_ok=True)
+    with os.scandir(src_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(suffix) or not entry.is_file():
+                continue
+            dst = dst_dir / entry.name
+            try:
+                os.link(entry.path, dst)
+            except OSError:
+                copy_file_kernel(entry.path, dst)
+
+
+def snapshot_run_artifacts(run_dir):
+    """Snapshot verdicts and dossiers into run_dir (background work)."""
+    verdicts_src = PROJECT_ROOT / "verdicts"
+    if verdicts_src.exists():
+        # Cloud runs write verdicts.jsonl; local runs write per-claim
+        # .json files - snapshot both
+        snapshot_files(verdicts_src, run_dir / "verdicts", (".json", ".jsonl"))
+
+    dossiers_src = PROJECT_ROOT / "dossiers"
+    if dossiers_src.exists():
+        snapshot_files(dossiers_src, run_dir / "dossiers", ".md")
 
 
 def get_current_stats():
@@ -47,35 +138,33 @@ def get_current_stats():
     results_file = PROJECT_ROOT / "output" / "results.csv"
     if not results_file.exists():
         return None
-    
-    import csv
+
+    # One native parse and two Arrow kernels instead of a DictReader
+    # loop with Python-side counters; runs on every POST /api/runs/save
+    table = pacsv.read_csv(str(results_file))
+    total = len(table)
     stats = {
-        'total': 0,
+        'total': total,
         'supported': 0,
         'contradicted': 0,
-        'undetermined': 0,
+        'undetermined': total,
         'avg_confidence': 0
     }
-    
-    confidences = []
-    with open(results_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            stats['total'] += 1
-            verdict = row.get('verdict', '').lower()
-            if verdict == 'supported':
-                stats['supported'] += 1
-            elif verdict == 'contradicted':
-                stats['contradicted'] += 1
-            else:
-                stats['undetermined'] += 1
-            
-            conf = float(row.get('confidence', 0))
-            confidences.append(conf)
-    
-    if confidences:
-        stats['avg_confidence'] = round(sum(confidences) / len(confidences) * 100, 1)
-    
+
+    if "verdict" in table.column_names:
+        counts = {
+            item["values"]: item["counts"]
+            for item in pc.value_counts(
+                pc.utf8_lower(table["verdict"])).to_pylist()
+        }
+        stats['supported'] = counts.get('supported', 0)
+        stats['contradicted'] = counts.get('contradicted', 0)
+        stats['undetermined'] = total - stats['supported'] - stats['contradicted']
+
+    if "confidence" in table.column_names and total > 0:
+        avg = pc.mean(table["confidence"]).as_py() or 0
+        stats['avg_confidence'] = round(avg * 100, 1)
+
     return stats
 
 
@@ -119,22 +208,6 @@ def save_current_run():
         # Copy results
         shutil.copy(results_file, run_dir / "results.csv")
         
-        # Copy verdicts
-        verdicts_src = PROJECT_ROOT / "verdicts"
-        if verdicts_src.exists():
-            verdicts_dst = run_dir / "verdicts"
-            verdicts_dst.mkdir(exist_ok=True)
-            for f in verdicts_src.glob("*.json"):
-                shutil.copy(f, verdicts_dst / f.name)
-        
-        # Copy dossiers
-        dossiers_src = PROJECT_ROOT / "dossiers"
-        if dossiers_src.exists():
-            dossiers_dst = run_dir / "dossiers"
-            dossiers_dst.mkdir(exist_ok=True)
-            for f in dossiers_src.glob("*.md"):
-                shutil.copy(f, dossiers_dst / f.name)
-        
         # Get stats
         stats = get_current_stats()
         
@@ -160,24 +233,51 @@ def save_current_run():
         runs.insert(0, run_meta)  # Most recent first
         save_runs(runs)
         
-        logger.info(f"Saved run: {run_id}")
+        # Verdict/dossier snapshots happen off-request; the run is
+        # already listed and its results.csv is in place, so the client
+        # gets its 202 without waiting on per-file copies
+        _PENDING_SNAPSHOTS[run_id] = _SNAPSHOT_EXECUTOR.submit(
+            snapshot_run_artifacts, run_dir)
+
+        logger.info(f"Saved run: {run_id} (snapshot in progress)")
         
         return jsonify({
             'success': True,
-            'run': run_meta
-        })
+            'run': run_meta,
+            'snapshot': 'pending'
+        }), 202
         
     except Exception as e:
         logger.error(f"Failed to save run: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@history_bp.route('/api/runs/<run_id>/status', methods=['GET'])
+def get_run_status(run_id):
+    """Report whether a run's background snapshot has finished."""
+    future = _PENDING_SNAPSHOTS.get(run_id)
+    if future is not None:
+        if not future.done():
+            return jsonify({'run_id': run_id, 'snapshot': 'pending'})
+        _PENDING_SNAPSHOTS.pop(run_id, None)
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Snapshot failed for run {run_id}: {error}")
+            return jsonify({'run_id': run_id, 'snapshot': 'failed',
+                            'error': str(error)}), 500
+        return jsonify({'run_id': run_id, 'snapshot': 'complete'})
+
+    # No pending future: either the snapshot already finished in a
+    # previous poll or the run was saved by an earlier process
+    if run_id in load_runs_by_id():
+        return jsonify({'run_id': run_id, 'snapshot': 'complete'})
+    return jsonify({'error': 'Run not found'}), 404
+
+
 @history_bp.route('/api/runs/<run_id>', methods=['GET'])
 def get_run(run_id):
     """Get details for a specific run."""
-    runs = load_runs()
-    
-    run = next((r for r in runs if r['id'] == run_id), None)
+    run = load_runs_by_id().get(run_id)
     if not run:
         return jsonify({'error': 'Run not found'}), 404
     
@@ -192,26 +292,43 @@ def get_run_results(run_id):
     
     if not results_file.exists():
         return jsonify({'error': 'Results not found for this run'}), 404
-    
-    import csv
-    results = []
-    with open(results_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            row['prediction'] = int(row.get('prediction', 0))
-            row['confidence'] = float(row.get('confidence', 0))
-            results.append(row)
-    
-    return jsonify({
-        'run_id': run_id,
-        'total': len(results),
-        'results': results
-    })
+
+    # Arrow parses the CSV (typed columns, so no per-row int/float
+    # coercion) and the response streams batch by batch: the client
+    # starts parsing while we serialize, and peak memory stays bounded
+    # no matter how large the run was
+    table = pacsv.read_csv(str(results_file))
+
+    def generate():
+        yield orjson.dumps({'run_id': run_id, 'total': len(table)})[:-1] \
+            + b',"results":['
+        first = True
+        for batch in table.to_batches(max_chunksize=4096):
+            body = orjson.dumps(batch.to_pylist())[1:-1]
+            if not body:
+                continue
+            if not first:
+                yield b','
+            yield body
+            first = False
+        yield b']}'
+
+    return Response(stream_with_context(generate()),
+                    mimetype='application/json')
 
 
 @history_bp.route('/api/runs/<run_id>/dossier/<claim_id>', methods=['GET'])
 def get_run_dossier(run_id, claim_id):
     """Get dossier for a claim from a specific run."""
+    # Both parameters land in filesystem paths; reject junk before any
+    # disk access (same whitelist as the main dossier endpoint)
+    try:
+        from flask_api.app import valid_claim_id
+    except ImportError:
+        from app import valid_claim_id
+    if not valid_claim_id(run_id) or not valid_claim_id(claim_id):
+        return jsonify({'error': 'Dossier not found'}), 404
+
     run_dir = HISTORY_DIR / f"run_{run_id}"
     dossier_file = run_dir / "dossiers" / f"{claim_id}.md"
     
@@ -239,10 +356,10 @@ def delete_run(run_id):
         except Exception as e:
             return jsonify({'error': f'Failed to delete: {e}'}), 500
     
-    # Update runs list
-    runs = load_runs()
-    runs = [r for r in runs if r['id'] != run_id]
-    save_runs(runs)
+    # Update runs list (skip the rewrite when the id wasn't listed)
+    if run_id in load_runs_by_id():
+        runs = [r for r in load_runs() if r['id'] != run_id]
+        save_runs(runs)
     
     return jsonify({'success': True, 'message': f'Deleted run {run_id}'})
 
@@ -263,9 +380,9 @@ def compare_runs():
     if not run1_id or not run2_id:
         return jsonify({'error': 'Both run1_id and run2_id required'}), 400
     
-    runs = load_runs()
-    run1 = next((r for r in runs if r['id'] == run1_id), None)
-    run2 = next((r for r in runs if r['id'] == run2_id), None)
+    runs_by_id = load_runs_by_id()
+    run1 = runs_by_id.get(run1_id)
+    run2 = runs_by_id.get(run2_id)
     
     if not run1 or not run2:
         return jsonify({'error': 'One or both runs not found'}), 404
@@ -0,0 +1,115 @@
+"""
+Evaluation Script - Scores pipeline predictions against labeled claims.
+
+Compares predictions in output/results.csv with the ground-truth labels
+carried on claims/claims.jsonl and prints accuracy, precision/recall,
+and the confusion matrix.
+
+Usage:
+    python scripts/evaluate.py
+"""
+
+import orjson
+import pyarrow.csv as pacsv
+import numpy as np
+from pathlib import Path
+
+# Configuration
+PROJECT_ROOT = Path(__file__).parent.parent
+CLAIMS_FILE = PROJECT_ROOT / "claims" / "claims.jsonl"
+RESULTS_FILE = PROJECT_ROOT / "output" / "results.csv"
+
+# Ground-truth label to binary prediction mapping
+LABEL_MAP = {
+    "consistent": 1,
+    "supported": 1,
+    "contradictory": 0,
+    "contradicted": 0,
+}
+
+
+def load_claims_with_labels() -> dict:
+    """Load ground-truth labels by claim_id from claims.jsonl."""
+    labels = {}
+    if not CLAIMS_FILE.exists():
+        return labels
+    # Binary read so orjson parses the raw bytes without a decode pass,
+    # and a substring test skips unlabeled lines before any parsing
+    with open(CLAIMS_FILE, "rb") as f:
+        for line in f:
+            if b'"label"' not in line:
+                continue
+            claim = orjson.loads(line)
+            label = LABEL_MAP.get(str(claim.get("label", "")).lower())
+            if label is not None:
+                labels[str(claim["claim_id"])] = label
+    return labels
+
+
+def load_predictions() -> dict:
+    """Load predictions by claim_id from results.csv."""
+    if not RESULTS_FILE.exists():
+        return {}
+    # Native multithreaded CSV parse with typed columns instead of a
+    # csv.DictReader building a fresh dict per row
+    table = pacsv.read_csv(str(RESULTS_FILE))
+    ids = table["Story ID"].to_pylist()
+    preds = table["Prediction"].to_pylist()
+    return {str(i): int(p) for i, p in zip(ids, preds)}
+
+
+def main():
+    """Main entry point for the evaluation script."""
+    print("=" * 60)
+    print("EVALUATION - Predictions vs Ground Truth")
+    print("=" * 60)
+
+    labels = load_claims_with_labels()
+    if not labels:
+        print(f"ERROR: No labeled claims found in {CLAIMS_FILE}")
+        return
+
+    predictions = load_predictions()
+    if not predictions:
+        print(f"ERROR: No predictions found in {RESULTS_FILE}")
+        print("  Run the pipeline first.")
+        return
+
+    # Vectorized confusion matrix: one pass to build the arrays, then
+    # four boolean reductions instead of a Python branch per claim
+    ids = list(labels)
+    y = np.fromiter((labels[i] for i in ids), dtype=np.int8, count=len(ids))
+    p = np.fromiter((predictions.get(i, -1) for i in ids),
+                    dtype=np.int8, count=len(ids))
+    scored = p != -1
+
+    tp = int(((y == 1) & (p == 1) & scored).sum())
+    fp = int(((y == 0) & (p == 1) & scored).sum())
+    tn = int(((y == 0) & (p == 0) & scored).sum())
+    fn = int(((y == 1) & (p == 0) & scored).sum())
+
+    total = tp + fp + tn + fn
+    missing = int((~scored).sum())
+
+    accuracy = (tp + tn) / total if total else 0
+    precision = tp / (tp + fp) if (tp + fp) else 0
+    recall = tp / (tp + fn) if (tp + fn) else 0
+    f1 = (2 * precision * recall / (precision + recall)
+          if (precision + recall) else 0)
+
+    print(f"\nLabeled claims: {len(labels)}")
+    print(f"Scored: {total}  (missing predictions: {missing})")
+
+    print("\nConfusion matrix:")
+    print("                 pred=1   pred=0")
+    print(f"  label=1    {tp:8d} {fn:8d}")
+    print(f"  label=0    {fp:8d} {tn:8d}")
+
+    print(f"\nAccuracy:  {accuracy:.2%}")
+    print(f"Precision: {precision:.2%}")
+    print(f"Recall:    {recall:.2%}")
+    print(f"F1 score:  {f1:.2%}")
+
+
+if __name__ == "__main__":
+    main()
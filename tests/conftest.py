@@ -3,16 +3,29 @@ Pytest fixtures and configuration for NovelVerified.AI tests.
 """
 
 import json
+import sys
 import tempfile
 import pytest
 from pathlib import Path
 
+# Make the project root and flask_api importable once for the whole
+# run, instead of repeating the insert at the top of every test file.
+# flask_api is needed directly because its blueprints import siblings
+# by bare module name.
+_PROJECT_ROOT = Path(__file__).parent.parent
+for _p in (str(_PROJECT_ROOT), str(_PROJECT_ROOT / "flask_api")):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
 
 # ============================================================================
 # Sample Data Fixtures
+#
+# Pure-data fixtures are session-scoped: they are literals the tests
+# never mutate, so one construction serves the whole run.
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_novel_text():
     """Sample novel text for testing chunking and embedding."""
     return """
@@ -40,7 +53,7 @@ def sample_novel_text():
     """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_claims():
     """Sample claims data for testing parsing and retrieval."""
     return [
@@ -71,7 +84,7 @@ def sample_claims():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_chunks():
     """Sample chunked text data."""
     return [
@@ -94,7 +107,7 @@ def sample_chunks():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_evidence():
     """Sample evidence data for reasoning tests."""
     return {
@@ -116,7 +129,7 @@ def sample_evidence():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_verdict():
     """Sample verdict data for dossier and aggregator tests."""
     return {
@@ -219,7 +232,7 @@ def temp_csv_files(temp_data_dir, sample_claims):
 # Mock Fixtures
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_claude_response():
     """Mock Claude API response for reasoning tests."""
     return {
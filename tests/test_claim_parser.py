@@ -1,13 +1,9 @@
 """Tests for the claim parser agent."""
 
-import sys
 import csv
 from pathlib import Path
 import pytest
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from agents.claim_parser import parse_csv
 
 
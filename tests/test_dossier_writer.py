@@ -1,13 +1,9 @@
 """Tests for the dossier writer agent."""
 
-import sys
 import json
 from pathlib import Path
 import pytest
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from agents.dossier_writer import (
     get_confidence_bar,
     format_temporal_evidence,
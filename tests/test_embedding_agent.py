@@ -0,0 +1,46 @@
+"""Tests for the embedding agent."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+import faiss
+
+import agents.embedding_agent as embedding_agent
+from agents.embedding_agent import build_faiss_index, IVF_NPROBE
+
+
+class TestBuildFaissIndex:
+    """Tests for FAISS index construction."""
+
+    @staticmethod
+    def _normalized_embeddings(n, dim=64, seed=0):
+        rng = np.random.default_rng(seed)
+        emb = rng.standard_normal((n, dim), dtype=np.float32)
+        return emb / np.linalg.norm(emb, axis=1, keepdims=True)
+
+    @pytest.mark.unit
+    def test_small_corpus_index_is_searchable(self):
+        """Below the IVF-PQ threshold a flat quantized index is built."""
+        emb = self._normalized_embeddings(100)
+        index = build_faiss_index(emb)
+
+        assert index.ntotal == 100
+        scores, ids = index.search(emb[:3], 5)
+        assert ids.shape == (3, 5)
+        # Each vector should find itself first on a flat index
+        assert list(ids[:, 0]) == [0, 1, 2]
+
+    @pytest.mark.slow
+    def test_large_corpus_builds_ivf_pq_with_nprobe(self, monkeypatch):
+        """Above the threshold the compressed index trains and probes."""
+        monkeypatch.setattr(embedding_agent, "IVF_PQ_THRESHOLD", 500)
+        emb = self._normalized_embeddings(2048)
+        index = build_faiss_index(emb)
+
+        assert index.ntotal == 2048
+        # nprobe lives on the inner IVF index behind the OPQ transform
+        assert faiss.extract_index_ivf(index).nprobe == IVF_NPROBE
+        scores, ids = index.search(emb[:4], 5)
+        assert ids.shape == (4, 5)
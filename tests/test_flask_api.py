@@ -1,24 +1,15 @@
 """Tests for the Flask API endpoints."""
 
-import sys
 import json
 import csv
 from pathlib import Path
 from unittest.mock import patch
 import pytest
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 @pytest.fixture
 def app(tmp_path):
     """Create test Flask app with temp data directories."""
-    # Add flask_api to path so blueprint imports work
-    flask_api_path = str(Path(__file__).parent.parent / "flask_api")
-    if flask_api_path not in sys.path:
-        sys.path.insert(0, flask_api_path)
-    
     # Create temp files
     results_file = tmp_path / "output" / "results.csv"
     results_file.parent.mkdir(parents=True)
@@ -87,7 +78,7 @@ class TestAPIIndex:
     def test_index_returns_api_info(self, client):
         """Index should return API information."""
         response = client.get("/")
-        data = json.loads(response.data)
+        data = response.get_json()
         
         assert response.status_code == 200
         assert "name" in data
@@ -104,7 +95,7 @@ class TestAPIResults:
         response = client.get("/api/results")
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "results" in data
         assert "total" in data
     
@@ -112,7 +103,7 @@ class TestAPIResults:
     def test_results_have_required_fields(self, client):
         """Results should have all required fields."""
         response = client.get("/api/results")
-        data = json.loads(response.data)
+        data = response.get_json()
         
         if data["results"]:
             result = data["results"][0]
@@ -130,7 +121,7 @@ class TestAPIDossier:
         response = client.get("/api/dossier/test_001")
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "content" in data
         assert "Test Dossier" in data["content"]
     
@@ -151,7 +142,7 @@ class TestAPIStats:
         response = client.get("/api/stats")
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "total" in data
         assert "supported" in data
         assert "contradicted" in data
@@ -166,7 +157,7 @@ class TestAPIVerdict:
         response = client.get("/api/verdict/test_001")
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "verdict" in data
     
     @pytest.mark.api
@@ -186,7 +177,7 @@ class TestAPIEvidence:
         response = client.get("/api/evidence/test_001")
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "evidence" in data
     
     @pytest.mark.api
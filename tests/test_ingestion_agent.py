@@ -1,12 +1,8 @@
 """Tests for the ingestion agent."""
 
-import sys
 from pathlib import Path
 import pytest
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from agents.ingestion_agent import count_tokens, chunk_text
 import tiktoken
 
@@ -14,9 +10,9 @@ import tiktoken
 class TestCountTokens:
     """Tests for the count_tokens function."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def encoding(self):
-        """Get tiktoken encoding."""
+        """Get tiktoken encoding (shared across the module)."""
         return tiktoken.get_encoding("cl100k_base")
     
     @pytest.mark.unit
@@ -42,9 +38,9 @@ class TestCountTokens:
 class TestChunkText:
     """Tests for the chunk_text function."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def encoding(self):
-        """Get tiktoken encoding."""
+        """Get tiktoken encoding (shared across the module)."""
         return tiktoken.get_encoding("cl100k_base")
     
     @pytest.mark.unit
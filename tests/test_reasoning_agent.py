@@ -1,14 +1,10 @@
 """Tests for the reasoning agent."""
 
-import sys
 import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 import pytest
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from agents.reasoning_agent import (
     synthesize_verdict,
     exponential_backoff_delay,
@@ -1,13 +1,9 @@
 """Tests for the results aggregator agent."""
 
-import sys
 import json
 from pathlib import Path
 import pytest
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from agents.results_aggregator import load_claims, VERDICT_MAP
 
 